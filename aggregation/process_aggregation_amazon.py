@@ -10,6 +10,7 @@ import os
 import sys
 import logging
 import boto3
+from botocore.config import Config
 from modules.aggregation import AggregateData
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
@@ -20,7 +21,9 @@ def run_aggregation():
     output_bucket = input_bucket + "-parquet"
     cloud = "Amazon"
     try:
-        storage_client = boto3.client('s3')
+        # Size the connection pool to the parallel download/upload concurrency
+        # and retry throttled or transient requests adaptively
+        storage_client = boto3.client('s3', config=Config(max_pool_connections=64, retries={'max_attempts': 10, 'mode': 'adaptive'}))
         aggregator = AggregateData(
             cloud=cloud,
             client=storage_client,
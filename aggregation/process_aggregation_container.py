@@ -29,7 +29,10 @@ def run_container():
             storage_client = BlobServiceClient.from_connection_string(connection_string)
         elif cloud == "Amazon":
             import boto3
-            storage_client = boto3.client('s3')
+            from botocore.config import Config
+            # Size the connection pool to the parallel download/upload concurrency
+            # and retry throttled or transient requests adaptively
+            storage_client = boto3.client('s3', config=Config(max_pool_connections=64, retries={'max_attempts': 10, 'mode': 'adaptive'}))
         elif cloud == "Google":
             from google.cloud import storage
             storage_client = storage.Client()
@@ -11,6 +11,7 @@ import os
 import sys
 import logging
 import boto3
+from botocore.config import Config
 from modules.utils import ProcessBacklog
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
@@ -20,7 +21,9 @@ def run_backlog_processing():
     input_bucket = os.environ.get("INPUT_BUCKET") 
     cloud = "Amazon"
     try:
-        storage_client = boto3.client('s3')
+        # Size the connection pool to the parallel download/upload concurrency
+        # and retry throttled or transient requests adaptively
+        storage_client = boto3.client('s3', config=Config(max_pool_connections=64, retries={'max_attempts': 10, 'mode': 'adaptive'}))
         pb = ProcessBacklog(cloud, storage_client, input_bucket, logger)
         pb.process_backlog_from_cloud()
         return 0
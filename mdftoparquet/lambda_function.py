@@ -1,10 +1,14 @@
 import boto3
 import os
+from botocore.config import Config
 from modules.mdf_to_parquet import mdf_to_parquet 
 
 # Cloud provider configuration
 cloud = "Amazon"
-storage_client = boto3.client("s3")
+# Size the connection pool to the parallel download/upload concurrency - the
+# default pool of 10 forces socket churn once more requests are in flight,
+# and adaptive retries absorb throttling under the parallel batches
+storage_client = boto3.client("s3", config=Config(max_pool_connections=64, retries={"max_attempts": 10, "mode": "adaptive"}))
 notification_client = boto3.client("sns")
 
 def lambda_handler(event, context):   
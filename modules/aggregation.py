@@ -1,13 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import os
 import json
 import logging
+import shutil
+import numpy as np
 import pandas as pd
-from pathlib import Path
 import sys
 import tempfile
-from modules.cloud_functions import upload_object, list_objects, download_object, list_objects_with_pagination
-from modules.utils import DownloadObjects
+from modules.cloud_functions import upload_object_from_buffer, list_objects, download_object, download_object_to_bytes, list_objects_with_pagination
+# Aggregation types supported by process_aggregation_for_trip
+SUPPORTED_AGGREGATIONS = {"avg", "median", "max", "min", "sum", "first", "last", "delta_sum", "delta_sum_pos", "delta_sum_neg"}
+# Output column order for trip summary results (matches the Arrow schema in
+# write_results_to_parquet); results are accumulated column-wise in this order
+RESULT_COLUMNS = ["DeviceID", "Message", "Signal", "Aggregation", "SignalValue", "SignalCount", "Duration", "TripStart", "TripEnd", "TripID", "Cluster"]
 
 class AggregateData:
     """
@@ -45,30 +51,45 @@ class AggregateData:
         self.aggregations_folder = aggregations_folder
         self.table_name = table_name
         self.logger = logger
+        self._upload_pool = None
+        self._upload_futures = []
+        self._list_cache = {}
+        # Shared download pool - threads are only spawned on first use, and
+        # sharing one pool caps the number of concurrent GETs across all
+        # devices instead of per message directory
+        self._download_pool = ThreadPoolExecutor(max_workers=32)
+        # Process-lifetime scratch directory for downloaded shards - one
+        # subdirectory per message read instead of a fresh temp dir each time.
+        # Point MDF_SCRATCH at a ramdisk (e.g. /dev/shm) to take the parquet
+        # read path off disk entirely
+        self._scratch_dir = os.path.join(os.environ.get("MDF_SCRATCH", tempfile.gettempdir()), f"agg_{os.getpid()}")
             
     def load_aggregation_json(self):
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                do = DownloadObjects(
-                    self.cloud,
-                    self.client,
-                    self.input_bucket,
-                    Path(temp_dir),
-                    "", 
-                    self.logger
-                )
-                
-                config = do.download_json_file(self.aggregations_file)
-                self.logger.info(f"Aggregation Configuration File: {config}")
-                self._extract_config_parameters(config)
-                
-                return config
-                
+            # Download the config straight into memory - no temp dir round-trip
+            data = download_object_to_bytes(self.cloud, self.client, self.input_bucket, self.aggregations_file, self.logger)
+            if data is None:
+                self.logger.error(f"No {self.aggregations_file} found in {self.input_bucket}")
+                return None
+
+            config = json.loads(data)
+            self.logger.info(f"Aggregation Configuration File: {config}")
+            self._extract_config_parameters(config)
+
+            return config
+
         except Exception as e:
             self.logger.error(f"Error loading JSON file: {e}")
             return None
             
     def _extract_config_parameters(self, config):
+        # Build a cluster name to cluster detail index so get_cluster_detail
+        # avoids a linear scan of cluster_details on every call
+        self._cluster_index = {}
+        for cluster_detail in config.get("cluster_details", []):
+            for cluster in cluster_detail.get("clusters", []):
+                self._cluster_index[cluster] = cluster_detail
+
         # Extract trip parameters
         if 'config' in config and 'trip' in config['config']:
             trip_config = config['config']['trip']
@@ -120,97 +141,162 @@ class AggregateData:
             raise ValueError(f"Unknown date mode: {date_mode}. Supported modes: 'previous_day', 'specific_period'")
 
     def list_parquet_files(self, prefix):
+        # Serve repeated listings of the same prefix from the per-run cache
+        # (clusters sharing devices and messages request the same tree)
+        files = self._list_cache.get(prefix)
+        if files is not None:
+            return files
+
         files = []
         try:
             result = list_objects_with_pagination(self.cloud, self.client, self.output_bucket, self.logger, prefix=prefix, supress=True)
             files = [obj["name"] for obj in result.get("objects", []) if obj["name"].endswith(".parquet")]
+            self._list_cache[prefix] = files
         except Exception as e:
             self.logger.error(f"Error listing Parquet files: {e}")
-        
+
         return files
 
+    # Function for priming the listing cache with a single LIST per
+    # device/message tree covering the full date range
+    def prime_listing_cache(self, config, date_paths):
+        # Single-day runs gain nothing over the per-day listings
+        if len(date_paths) <= 1:
+            return
+
+        # Collect the distinct device/message trees referenced by the config
+        tree_prefixes = set()
+        for device_cluster in config.get("device_clusters", []):
+            cluster_detail = self.get_cluster_detail(config, device_cluster.get("cluster"))
+            if not cluster_detail:
+                continue
+
+            details = cluster_detail.get("details", {})
+            messages = {details.get("trip_identifier", {}).get("message", "")}
+            messages.update(agg.get("message", "") for agg in details.get("aggregations", []))
+            messages.discard("")
+
+            for device_id in device_cluster.get("devices", []):
+                for message in messages:
+                    tree_prefixes.add(f"{device_id}/{message}/")
+
+        # List each tree once and partition the object names by date path, so
+        # the per-day list_parquet_files calls become cache hits (including
+        # days without any files)
+        for tree_prefix in sorted(tree_prefixes):
+            try:
+                result = list_objects_with_pagination(self.cloud, self.client, self.output_bucket, self.logger, prefix=tree_prefix, supress=True)
+            except Exception as e:
+                self.logger.error(f"Error listing Parquet files: {e}")
+                continue
+
+            files_by_date = {date_path: [] for date_path in date_paths}
+            for obj in result.get("objects", []):
+                name = obj["name"]
+                if not name.endswith(".parquet"):
+                    continue
+
+                date_path = name[len(tree_prefix):].rsplit("/", 1)[0]
+                if date_path in files_by_date:
+                    files_by_date[date_path].append(name)
+
+            for date_path, files in files_by_date.items():
+                self._list_cache[f"{tree_prefix}{date_path}"] = files
+
+        self.logger.info(f"Primed listing cache for {len(tree_prefixes)} device/message trees across {len(date_paths)} days")
+
     def get_parquet_files(self, files, temp_dir):
+        # For Local storage the bucket is a directory - read the Parquet files
+        # in place instead of copying them into the temp dir first
+        if self.cloud == "Local":
+            return [os.path.join(self.output_bucket, file_path) for file_path in files]
+
         local_files = []
-        for file_path in files:
+
+        # Download one object (used by the download pool below)
+        def download_one(file_path):
             local_path = os.path.join(temp_dir, os.path.basename(file_path))
             success = download_object(
-                self.cloud, 
-                self.client, 
-                self.output_bucket, 
-                file_path, 
+                self.cloud,
+                self.client,
+                self.output_bucket,
+                file_path,
                 local_path,
                 self.logger,
                 True
             )
-            
+            return file_path, local_path, success
+
+        # Keep several GETs in flight on the shared download pool - each
+        # download is a blocking HTTP round-trip inside the cloud SDK, so
+        # threads overlap the waits without paying pool startup/teardown for
+        # every message directory
+        for file_path, local_path, success in self._download_pool.map(download_one, files):
             if success:
                 local_files.append(local_path)
             else:
                 self.logger.error(f"Failed to download {file_path}")
-                
+
         return local_files
 
+    # Function for detecting trip windows in an array of timestamps
+    def _find_trip_windows(self, ts_arr):
+        if len(ts_arr) == 0:
+            return []
+
+        # Sort the timestamps once (in case shards arrived out of order) and
+        # detect trip gaps in int64 nanosecond space - a single vectorized
+        # pass instead of the pandas diff/compare/filter chain
+        ts_arr = np.sort(ts_arr.astype("datetime64[ns]"))
+        t_ns = ts_arr.view("i8")
+        gap_ns = int(self.trip_gap_min * 60 * 1_000_000_000)
+
+        # Identify trip starts: the first row plus every row following a gap
+        start_idx = np.concatenate(([0], np.nonzero((t_ns[1:] - t_ns[:-1]) > gap_ns)[0] + 1))
+
+        # Identify trip ends: the row just before each next trip start, plus
+        # the last row - no per-trip rescan of the timestamp array
+        end_idx = np.concatenate((start_idx[1:] - 1, [len(t_ns) - 1]))
+
+        # Filter out trips that are shorter than the minimum duration
+        min_length_ns = int(self.trip_min_length_min * 60 * 1_000_000_000)
+        keep = (t_ns[end_idx] - t_ns[start_idx]) >= min_length_ns
+
+        return [
+            (pd.Timestamp(start), pd.Timestamp(end))
+            for start, end in zip(ts_arr[start_idx[keep]], ts_arr[end_idx[keep]])
+        ]
+
     # Function for extracting trip windows
     def get_trip_windows(self, trip_path):
-        import pyarrow.parquet as pq
-        
+        import pyarrow.dataset as ds
+
         try:
             # List Parquet files in trip directory
             files = self.list_parquet_files(trip_path)
             if len(files) == 0:
                 return []
-                
-            # Download files and load into dataframes
-            with tempfile.TemporaryDirectory() as temp_dir:
-                local_files = self.get_parquet_files(files, temp_dir)
+
+            # Download files and scan the timestamp column in a single parallel
+            # pass - trip-window detection never touches a dataframe
+            scratch_dir = os.path.join(self._scratch_dir, trip_path.replace("/", "_"))
+            os.makedirs(scratch_dir, exist_ok=True)
+            try:
+                local_files = self.get_parquet_files(files, scratch_dir)
                 if not local_files:
                     return []
-                    
-                dfs = [pq.read_table(f).to_pandas() for f in local_files]
-                if not dfs:
-                    return []
-                    
-                df = pd.concat(dfs, ignore_index=True)
-            
-            df["t"] = pd.to_datetime(df["t"])
-            df["time_diff"] = df["t"].diff()
-
-            # Identify trip starts
-            trip_starts = df[df["time_diff"] > pd.Timedelta(minutes=self.trip_gap_min)][
-                "t"
-            ].tolist()
-            if df["t"].iloc[0] not in trip_starts:
-                trip_starts.insert(0, df["t"].iloc[0])
-
-            # Identify trip ends
-            trip_ends = []
-            for i in range(len(trip_starts) - 1):
-                # Find the last timestamp before the next trip starts
-                last_time_before_next_trip = df[df["t"] < trip_starts[i + 1]]["t"].iloc[-1]
-                trip_ends.append(last_time_before_next_trip)
-
-            # Handle the last trip end
-            trip_ends.append(df["t"].iloc[-1])
-
-            # Filter out trips that are shorter than the minimum duration
-            trip_windows = [
-                (start, end)
-                for start, end in zip(trip_starts, trip_ends)
-                if (end - start) >= pd.Timedelta(minutes=self.trip_min_length_min)
-            ]
-
-            return trip_windows
-            
+
+                table = ds.dataset(local_files, format="parquet").to_table(columns=["t"], use_threads=True)
+            finally:
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+
+            return self._find_trip_windows(table.column("t").to_numpy())
+
         except Exception as e:
             # self.logger.error(f"--- Error identifying trip windows: {e}")
             return []
    
-    # Function for creating a date range
-    def daterange(self):
-        for n in range((self.end_date - self.start_date).days + 1):
-            yield self.start_date + timedelta(n)
-    
-    # Function for processing a single message for a trip
+# Function for processing a single message for a trip
     def process_aggregation_for_trip(
         self,
         device_id,
@@ -219,107 +305,87 @@ class AggregateData:
         aggregation_types,
         trip_window,
         cluster_name,
-        df
+        df,
+        results
     ):
-       
-        df = df[(df["t"] >= trip_window[0]) & (df["t"] <= trip_window[1])]
-        results = []
         if df.empty:
-            return results
+            return
 
         start_str = trip_window[0].strftime("%Y-%m-%d %H:%M:%S")
         end_str = trip_window[1].strftime("%Y-%m-%d %H:%M:%S")
         self.logger.info(f"---- Processing trip from {start_str} to {end_str} for device {device_id}, message {message}")
-  
-        for signal in signals:
-            if signal not in df.columns:
-                continue
-                
-            # Calculate aggregations for this signal
+
+        signals_present = [signal for signal in signals if signal in df.columns]
+        if not signals_present:
+            return
+
+        # Compute each family of aggregates in one vectorized pass across all
+        # signals instead of one pandas dispatch per (signal, aggregation).
+        # The named reductions stay on pandas' C path (exact median); the
+        # edge values, counts and delta reductions all share one float64 buffer
+        df_signals = df[signals_present]
+        base_agg_map = {"avg": "mean", "median": "median", "max": "max", "min": "min", "sum": "sum"}
+        base_aggs = list({base_agg_map[a] for a in aggregation_types if a in base_agg_map})
+        stats = df_signals.agg(base_aggs) if base_aggs else None
+
+        values = df_signals.to_numpy(dtype="float64")
+        signal_index = {signal: i for i, signal in enumerate(signals_present)}
+        edge_values = {"first": values[0], "last": values[-1]}
+        delta_values = None
+        if any(a in ("delta_sum", "delta_sum_pos", "delta_sum_neg") for a in aggregation_types):
+            # One diff feeds all three delta variants
+            delta = np.diff(values, axis=0)
+            delta_values = {
+                "delta_sum": np.nansum(delta, axis=0),
+                "delta_sum_pos": np.nansum(np.clip(delta, 0, None), axis=0),
+                "delta_sum_neg": np.nansum(np.clip(delta, None, 0), axis=0),
+            }
+
+        # Calculate count, duration and trip meta data once for the trip; the
+        # frame is sliced from time-sorted data, so the extrema are the endpoints
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+        duration = (df["t"].iat[-1] - df["t"].iat[0]).total_seconds()
+        trip_id = f"{device_id}_{(trip_window[0].strftime('%Y%m%dT%H%M%S.%f'))}"
+        trip_start = trip_window[0]
+        trip_end = trip_window[1]
+
+        for signal in signals_present:
+            signal_count = int(counts[signal_index[signal]])
             for agg_type in aggregation_types:
-                value = None
-                if agg_type == "avg":
-                    value = df[signal].mean()
-                elif agg_type == "median":
-                    value = df[signal].median()
-                elif agg_type == "max":
-                    value = df[signal].max()
-                elif agg_type == "min":
-                    value = df[signal].min()
-                elif agg_type == "sum":
-                    value = df[signal].sum()
-                elif agg_type == "first":
-                    value = df[signal].iloc[0]
-                elif agg_type == "last":
-                    value = df[signal].iloc[-1]
-                elif agg_type == "delta_sum":
-                    value = df[signal].diff().sum()
-                elif agg_type == "delta_sum_pos":
-                    delta = df[signal].diff()
-                    value = delta[delta > 0].sum()
-                elif agg_type == "delta_sum_neg":
-                    delta = df[signal].diff()
-                    value = delta[delta < 0].sum()
+                # Aggregation types were validated when the cluster's
+                # aggregations were grouped, so the dispatch is unconditional
+                if agg_type in base_agg_map:
+                    value = stats.loc[base_agg_map[agg_type], signal]
+                elif agg_type in edge_values:
+                    value = edge_values[agg_type][signal_index[signal]]
                 else:
-                    self.logger.warning(f"---- Unsupported aggregation type: {agg_type}")
-                    continue
-                    
-                # Calculate count and duration like the original implementation
-                count = df[signal].count()
-                duration = (df["t"].max() - df["t"].min()).total_seconds()
-
-                # Create a trip ID using the same format as original
-                trip_id = f"{device_id}_{(trip_window[0].strftime('%Y%m%dT%H%M%S.%f'))}"
-                trip_start = trip_window[0]
-                trip_end = trip_window[1]
-        
-                # Append result as a list in the same order as the columns
+                    value = delta_values[agg_type][signal_index[signal]]
+
+                # Append the result column-wise - no per-row list objects
                 if value is not None:
-                    results.append(
-                        [
-                            device_id,
-                            message,
-                            signal,
-                            agg_type,
-                            float(value),
-                            count,
-                            duration,
-                            trip_start,  
-                            trip_end,  
-                            trip_id,
-                            cluster_name,
-                        ]
-                    )
-                
-        return results
+                    results["DeviceID"].append(device_id)
+                    results["Message"].append(message)
+                    results["Signal"].append(signal)
+                    results["Aggregation"].append(agg_type)
+                    results["SignalValue"].append(float(value))
+                    results["SignalCount"].append(signal_count)
+                    results["Duration"].append(duration)
+                    results["TripStart"].append(trip_start)
+                    results["TripEnd"].append(trip_end)
+                    results["TripID"].append(trip_id)
+                    results["Cluster"].append(cluster_name)
 
     # Function for writing the results from one day to a Parquet file
     def write_results_to_parquet(self, results, date):
         import pyarrow.parquet as pq
         import pyarrow as pa
         
-        if not results:
+        row_count = len(results["DeviceID"])
+        if row_count == 0:
             self.logger.info("No results to write")
             return False
-            
+
         try:
-            # Create DataFrame with explicit column names matching the original implementation
-            df = pd.DataFrame(
-            results,
-            columns=[
-                "DeviceID",
-                "Message",
-                "Signal",
-                "Aggregation",
-                "SignalValue",
-                "SignalCount",
-                "Duration",
-                "TripStart",
-                "TripEnd",
-                "TripID",
-                "Cluster",
-            ],
-            )
             schema = pa.schema(
                 [
                     ("DeviceID", pa.string()),
@@ -335,142 +401,242 @@ class AggregateData:
                     ("Cluster", pa.string()),
                 ]
             )
-            
+
+            # Convert the column-wise results in fixed-size record batches
+            # (no transpose, no pandas round-trip), so the Arrow conversion
+            # never materializes more than one batch on large days
+            batch_rows = 50000
+
+            def record_batches():
+                for start in range(0, row_count, batch_rows):
+                    yield pa.RecordBatch.from_arrays(
+                        [pa.array(results[field.name][start:start + batch_rows], type=field.type) for field in schema],
+                        schema=schema,
+                    )
+
+            # Dictionary-encode the low-cardinality string columns and compress
+            # with ZSTD - the trip summary shrinks well below the snappy
+            # defaults at similar decode speed. TripID repeats across signals
+            # and aggregations but is high cardinality across trips, so it gets
+            # delta byte-array encoding instead of a dictionary
+            writer_options = dict(
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=["DeviceID", "Message", "Signal", "Aggregation", "Cluster"],
+                column_encoding={"TripID": "DELTA_BYTE_ARRAY"},
+                write_statistics=True,
+            )
+
             # Construct date path like the original
             date_path = date.strftime("%Y/%m/%d")
-            
+
             if self.cloud == "Local":
                 local_path = f"{self.output_bucket}/{self.aggregations_folder}/{self.table_name}/{date_path}"
                 os.makedirs(local_path, exist_ok=True)
                 file_path = f"{local_path}/{date.strftime('%Y%m%d')}.parquet"
-                pq.write_table(pa.Table.from_pandas(df, schema=schema), file_path)
-                self.logger.info(f"- Stored aggregation Parquet locally | {len(results)} rows | {file_path}")
+                with pq.ParquetWriter(file_path, schema, **writer_options) as writer:
+                    for batch in record_batches():
+                        writer.write_batch(batch)
+                self.logger.info(f"- Stored aggregation Parquet locally | {row_count} rows | {file_path}")
                 return True
             else:
-                # For cloud storage, use a temp file and upload
-                tmp_file_path = None
-                try:
-                    # Create a named temporary file
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".parquet") as tmp_file:
-                        tmp_file_path = tmp_file.name
-                    
-                    # Write DataFrame to Parquet file locally with the schema
-                    # We do this after closing the file to avoid keeping it open
-                    pq.write_table(pa.Table.from_pandas(df, schema=schema), tmp_file_path)
-                    
-                    # Define cloud path
-                    cloud_path = f"{self.aggregations_folder}/{self.table_name}/{date_path}/{date.strftime('%Y%m%d')}.parquet"
-                    
-                    # Upload to cloud storage
-                    success = upload_object(
-                        self.cloud,
-                        self.client,
-                        self.output_bucket,
-                        cloud_path,
-                        tmp_file_path,
-                        self.logger
-                    )
-                    
-                    if success:
-                        self.logger.info(f"- Stored aggregation Parquet on cloud | {len(results)} rows | {cloud_path}")
-                        return True
-                    else:
-                        self.logger.error(f"- Failed to upload results to {cloud_path}")
-                        return False
-                        
-                finally:
-                    # Clean up temp file in the finally block to ensure it happens
-                    if tmp_file_path and os.path.exists(tmp_file_path):
-                        try:
-                            os.remove(tmp_file_path)
-                        except Exception as e:
-                            self.logger.warning(f"Could not remove temporary file {tmp_file_path}: {e}")
-                            # Not a critical error, we can continue
-                    
+                # For cloud storage, serialize to an in-memory buffer and hand the
+                # upload to the background pool - no temp file round-trip
+                sink = pa.BufferOutputStream()
+                with pq.ParquetWriter(sink, schema, **writer_options) as writer:
+                    for batch in record_batches():
+                        writer.write_batch(batch)
+                data = sink.getvalue().to_pybytes()
+
+                # Define cloud path
+                cloud_path = f"{self.aggregations_folder}/{self.table_name}/{date_path}/{date.strftime('%Y%m%d')}.parquet"
+
+                # Upload to cloud storage in the background
+                if self._upload_pool is None:
+                    self._upload_pool = ThreadPoolExecutor(max_workers=4)
+
+                self._upload_futures.append(
+                    self._upload_pool.submit(self._upload_results_buffer, data, cloud_path, row_count)
+                )
+                return True
+
         except Exception as e:
             self.logger.error(f"- Error writing results to Parquet: {e}")
             return False
-   
+
+    # Function for uploading one day's result buffer from a background worker
+    def _upload_results_buffer(self, data, cloud_path, row_count):
+        success = upload_object_from_buffer(
+            self.cloud,
+            self.client,
+            self.output_bucket,
+            cloud_path,
+            data,
+            self.logger
+        )
+
+        if success:
+            self.logger.info(f"- Stored aggregation Parquet on cloud | {row_count} rows | {cloud_path}")
+        else:
+            self.logger.error(f"- Failed to upload results to {cloud_path}")
+
+        return success
+
+    # Function for blocking on any outstanding background uploads
+    def wait_for_uploads(self):
+        if self._upload_futures:
+            wait(self._upload_futures)
+            self._upload_futures = []
+
+        if self._upload_pool is not None:
+            self._upload_pool.shutdown(wait=True)
+            self._upload_pool = None
+
     # Function for extracting cluster details from config
     def get_cluster_detail(self, config, cluster):
-        for cluster_detail in config.get("cluster_details", []):
-            if cluster in cluster_detail.get("clusters"):
-                return cluster_detail
-                
-        self.logger.warning(f"Cluster {cluster} not found in configuration")
-        return None
+        cluster_detail = self._cluster_index.get(cluster)
+        if cluster_detail is None:
+            self.logger.warning(f"Cluster {cluster} not found in configuration")
+        return cluster_detail
+
+    # Function for grouping a cluster's aggregations by message, so each message
+    # directory is listed and read once per device and day. Aggregation types
+    # are validated here, once per cluster, instead of inside the trip loop
+    def group_aggregations_by_message(self, cluster_aggregations):
+        aggregations_by_message = {}
+        for agg in cluster_aggregations:
+            agg_message = agg.get("message", "")
+            if not agg_message:
+                continue
+
+            agg_types = []
+            for agg_type in agg.get("aggregation", []):
+                if agg_type in SUPPORTED_AGGREGATIONS:
+                    agg_types.append(agg_type)
+                else:
+                    self.logger.warning(f"Unsupported aggregation type: {agg_type}")
+
+            aggregations_by_message.setdefault(agg_message, []).append((agg.get("signal", []), agg_types))
+
+        return aggregations_by_message
+
+    # Function for listing, downloading and scanning one message directory for
+    # a device and day, returning a time-sorted dataframe (or None)
+    def _load_message_frame(self, device_id, agg_message, date_path, message_aggregations):
+        import pyarrow.dataset as ds
+
+        # list files in message directory path
+        files = self.list_parquet_files(f"{device_id}/{agg_message}/{date_path}")
+        if len(files) == 0:
+            self.logger.info(f"--- No Parquet files found for {agg_message} - skipping")
+            return None
+
+        # download files to a per-message scratch subdirectory and scan them
+        # (the device/message/date triple is unique per in-flight task)
+        scratch_dir = os.path.join(self._scratch_dir, f"{device_id}_{agg_message}_{date_path.replace('/', '_')}")
+        os.makedirs(scratch_dir, exist_ok=True)
+        try:
+            local_files = self.get_parquet_files(files, scratch_dir)
+            if not local_files:
+                self.logger.info(f"--- Failed to download files for {agg_message}")
+                return None
+
+            # Read all files via a single dataset scan, projecting only the
+            # timestamp and the requested signal columns (parallel reads,
+            # no per-file pandas copies)
+            needed_columns = ["t"]
+            for agg_signals, _ in message_aggregations:
+                for signal in agg_signals:
+                    if signal not in needed_columns:
+                        needed_columns.append(signal)
+
+            dataset = ds.dataset(local_files, format="parquet")
+            columns = [c for c in needed_columns if c in dataset.schema.names]
+            df = dataset.to_table(columns=columns, use_threads=True).to_pandas(split_blocks=True, self_destruct=True)
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        # Halve the working set: CAN signal values carry at most 16-bit wire
+        # precision, so float32 loses nothing for the per-trip reductions
+        # (the delta/edge reductions still accumulate in float64)
+        float_columns = df.columns[df.dtypes == "float64"]
+        if len(float_columns) > 0:
+            df[float_columns] = df[float_columns].astype("float32")
+
+        # Sort once by time so each trip window can be sliced by position via
+        # searchsorted instead of boolean masks
+        df.sort_values("t", inplace=True, ignore_index=True)
+        return df
 
     # Function for processing a single device
     def process_single_device(
-        self, cluster, device_id, cluster_detail, cluster_aggregations, date_path
+        self, cluster, device_id, cluster_detail, aggregations_by_message, date_path
     ):
-        import pandas as pd
-        import pyarrow.parquet as pq
-        
-        device_results = []
-        
+        device_results = {name: [] for name in RESULT_COLUMNS}
+
         try:
             # identify trip windows for the device & day based on the cluster trip message
             trip_message = cluster_detail.get("details", {}).get("trip_identifier", {}).get("message", "")
             if trip_message == "":
                 self.logger.info(f"--- No trip identifier message found for cluster {cluster}")
-                return []
+                return device_results
+
+            # Get trip windows for the device using the trip identifier message.
+            # If the trip message is itself aggregated, load its frame once and
+            # detect the windows from that - the directory is only downloaded
+            # and scanned a single time
+            loaded_frames = {}
+            if trip_message in aggregations_by_message:
+                df_trip_message = self._load_message_frame(
+                    device_id, trip_message, date_path, aggregations_by_message[trip_message]
+                )
+                if df_trip_message is None:
+                    return device_results
+
+                loaded_frames[trip_message] = df_trip_message
+                trip_windows = self._find_trip_windows(df_trip_message["t"].to_numpy())
+            else:
+                trip_path = f"{device_id}/{trip_message}/{date_path}"
+                trip_windows = self.get_trip_windows(trip_path)
 
-            # Get trip windows for the device using the trip identifier message
-            trip_path = f"{device_id}/{trip_message}/{date_path}"
-            trip_windows = self.get_trip_windows(trip_path)
             if len(trip_windows) == 0:
                 # self.logger.info(f"--- No trip windows found for {device_id}")
-                return []
-            
+                return device_results
+
             # extract data aggregation values per trip and add to device_results
-            aggregations_list = cluster_aggregations
-            for agg in aggregations_list:
-                agg_message = agg.get("message", "")
-                if not agg_message:
-                    continue
-                    
-                agg_path = f"{device_id}/{agg_message}/{date_path}"
-                
-                # list files in message directory path
-                files = self.list_parquet_files(agg_path)
-                if len(files) == 0:
-                    self.logger.info(f"--- No Parquet files found for {agg_message} - skipping")
+            for agg_message, message_aggregations in aggregations_by_message.items():
+                df = loaded_frames.pop(agg_message, None)
+                if df is None:
+                    df = self._load_message_frame(device_id, agg_message, date_path, message_aggregations)
+                if df is None:
                     continue
 
-                # download files to temp dir and process
-                with tempfile.TemporaryDirectory(prefix=f"temp_{device_id}_{agg_message}_{date_path.replace('/', '_')}_") as temp_dir:
-                    local_files = self.get_parquet_files(files, temp_dir)
-                    if not local_files:
-                        self.logger.info(f"--- Failed to download files for {agg_message}")
-                        continue
-                        
-                    # Read parquet files into dataframes and concatenate
-                    dfs = [pq.read_table(f).to_pandas() for f in local_files]
-                    if not dfs:
-                        continue
-                        
-                    df = pd.concat(dfs, ignore_index=True)
-                    
-                    # Process each trip window
-                    for trip_window in trip_windows:
-                        agg_results = self.process_aggregation_for_trip(
+                # The binary searches run on a plain int64 nanosecond view, so
+                # no datetime unit conversion happens per trip
+                t_ns = df["t"].to_numpy().astype("datetime64[ns]").view("i8")
+
+                # Process each trip window for each aggregation entry using the message
+                for trip_window in trip_windows:
+                    lo = np.searchsorted(t_ns, trip_window[0].value, side="left")
+                    hi = np.searchsorted(t_ns, trip_window[1].value, side="right")
+                    df_trip = df.iloc[lo:hi]
+
+                    for agg_signals, agg_types in message_aggregations:
+                        self.process_aggregation_for_trip(
                             device_id,
                             agg_message,
-                            agg.get("signal", []),
-                            agg.get("aggregation", []),
+                            agg_signals,
+                            agg_types,
                             trip_window,
                             cluster,
-                            df
+                            df_trip,
+                            device_results
                         )
-                        
-                        if agg_results:
-                            device_results.extend(agg_results)
-                            
+
         except Exception as e:
             self.logger.error(f"Error processing device {device_id}: {e}")
-            return []
-            
+            return {name: [] for name in RESULT_COLUMNS}
+
         return device_results
 
     # Function for overall processing of the data lake
@@ -483,15 +649,22 @@ class AggregateData:
             return 0
             
         days_processed = 0
-        total_days = (self.end_date - self.start_date).days + 1
+
+        # Precompute the full date range and the matching date paths once
+        date_range = pd.date_range(self.start_date, self.end_date, freq="D")
+        date_paths = date_range.strftime("%Y/%m/%d").tolist()
+        total_days = len(date_range)
         self.logger.info(f"Processing data from {self.start_date} to {self.end_date}")
-        
+
+        # For multi-day ranges, list each device/message tree once up front
+        # instead of once per day
+        self.prime_listing_cache(config, date_paths)
+
         # Process each day in range
-        for i, single_date in enumerate(self.daterange(), start=1):
+        for i, (single_date, date_path) in enumerate(zip(date_range.to_pydatetime(), date_paths), start=1):
             self.logger.info(f"Processing date {i}/{total_days}: {single_date}")
-            daily_results = []
-            date_path = single_date.strftime("%Y/%m/%d")
-            
+            daily_results = {name: [] for name in RESULT_COLUMNS}
+
             # Process each cluster of devices
             for device_cluster in config.get("device_clusters", []):
                 cluster = device_cluster.get("cluster")
@@ -501,29 +674,43 @@ class AggregateData:
                     continue
                     
                 cluster_aggregations = cluster_detail.get("details", {}).get("aggregations", [])
+                aggregations_by_message = self.group_aggregations_by_message(cluster_aggregations)
                 self.logger.info(f"- Processing cluster: {cluster}")
-                
-                # Process each device in cluster
-                for device_id in device_cluster.get("devices", []):
-                    self.logger.info(f"-- Processing device: {device_id}")
-                    
-                    device_results = self.process_single_device(
-                        cluster,
-                        device_id,
-                        cluster_detail,
-                        cluster_aggregations,
-                        date_path
-                    )
-                    
-                    if device_results:
-                        daily_results.extend(device_results)
-                        
+
+                # Process the devices in the cluster in parallel - each device is
+                # dominated by cloud list/download round-trips, so threads overlap
+                # the waits while results are still collected in device order
+                devices = device_cluster.get("devices", [])
+                with ThreadPoolExecutor(max_workers=min(16, max(len(devices), 1))) as executor:
+                    futures = []
+                    for device_id in devices:
+                        self.logger.info(f"-- Processing device: {device_id}")
+                        futures.append(executor.submit(
+                            self.process_single_device,
+                            cluster,
+                            device_id,
+                            cluster_detail,
+                            aggregations_by_message,
+                            date_path
+                        ))
+
+                    for future in futures:
+                        device_results = future.result()
+                        if device_results["DeviceID"]:
+                            for name in RESULT_COLUMNS:
+                                daily_results[name].extend(device_results[name])
+
             # Write results for this day if any
-            if daily_results:
+            if daily_results["DeviceID"]:
                 days_processed += 1
                 self.write_results_to_parquet(daily_results, single_date)
             else:
                 self.logger.info(f"- No data extracted for {single_date}")
-                
+
+        # Block until any background result uploads have completed, then drop
+        # the run's scratch directory
+        self.wait_for_uploads()
+        shutil.rmtree(self._scratch_dir, ignore_errors=True)
+
         self.logger.info(f"Stored {days_processed} days with data across {total_days} days")
         return days_processed
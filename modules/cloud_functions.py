@@ -1,10 +1,24 @@
 import json
-import os
 import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote_plus
 
 # Note: load_credentials and load_creds_file_into_env functions
 # have been moved to utils_testing.py
-        
+
+# Valid CANedge log file extensions (upper-cased, including the dot)
+_VALID_LOG_EXTENSIONS = frozenset({".MF4", ".MFC", ".MFE", ".MFM"})
+
+def _has_valid_extension(filename):
+    # Uppercase only the 4-char suffix instead of the full path - this runs
+    # once per candidate object key
+    return filename[-4:].upper() in _VALID_LOG_EXTENSIONS
+
+
 def get_log_file_object_paths(cloud, event, logger):
     """
     Extract a list of object paths from the event.
@@ -16,20 +30,8 @@ def get_log_file_object_paths(cloud, event, logger):
         logger: Logger object for logging messages
         
     Returns:
-        list: List of Path objects representing object paths
+        list: List of object path strings
     """
-    from pathlib import Path
-    from urllib.parse import unquote_plus
-    
-    # Valid log file extensions
-    valid_extensions = [".MF4", ".MFC", ".MFE", ".MFM"]
-    
-    # Helper function to check if a file has valid extension
-    def has_valid_extension(filename):
-        return any(filename.upper().endswith(ext) for ext in valid_extensions)
-    
-    from urllib.parse import urlparse
-    
     log_file_object_paths = []
     
     # If event is a list, assume it follows the backlog.json structure regardless of cloud type
@@ -39,35 +41,40 @@ def get_log_file_object_paths(cloud, event, logger):
             logger.info(f"Processing list-type event with {len(event)} items")
             for item in event:
                 if isinstance(item, str):
-                    if has_valid_extension(item):
+                    if _has_valid_extension(item):
                         # logger.info(f"Adding object path from list: {item}")
-                        log_file_object_paths.append(Path(item))
+                        log_file_object_paths.append(item)
         else:
             if cloud == "Amazon":
                 if "Records" in event:
                     for record in event["Records"]:
                         if "s3" in record and "object" in record["s3"] and "key" in record["s3"]["object"]:
                             object_key = unquote_plus(record["s3"]["object"]["key"])
-                            if has_valid_extension(object_key):
-                                log_file_object_paths.append(Path(object_key))
+                            if _has_valid_extension(object_key):
+                                log_file_object_paths.append(object_key)
                             
             elif cloud == "Azure":
                 data = event.get_json()
                 url = data.get('url')
-                # Extract blob path directly from URL
-                parsed_url = urlparse(url)
-                path_parts = parsed_url.path.split('/')
-                object_key = '/'.join(path_parts[2:]) if len(path_parts) >= 3 else None
-                
+                # Extract blob path directly from the URL with two forward
+                # scans (past the host, past the container) instead of
+                # building a ParseResult and re-joining the path parts
+                object_key = None
+                if url:
+                    host_end = url.find('/', url.find('//') + 2)
+                    container_end = url.find('/', host_end + 1) if host_end != -1 else -1
+                    if container_end != -1:
+                        object_key = url[container_end + 1:]
+
                 logger.info(f"Extracted object key: {object_key}")
-                if object_key and has_valid_extension(object_key):
-                    log_file_object_paths.append(Path(object_key))
+                if object_key and _has_valid_extension(object_key):
+                    log_file_object_paths.append(object_key)
                     
             elif cloud == "Google":
                 if hasattr(event, 'data') and 'name' in event.data:
                     file_name = event.data['name']
-                    if has_valid_extension(file_name):
-                        log_file_object_paths.append(Path(file_name))
+                    if _has_valid_extension(file_name):
+                        log_file_object_paths.append(file_name)
             else:
                 logger.error(f"Unsupported cloud provider: {cloud}")
         
@@ -79,9 +86,86 @@ def get_log_file_object_paths(cloud, event, logger):
         return []
         
 
+# Shared S3 transfer configuration: 8 MiB parts fetched/sent by up to 16
+# threads per object, so large MF4/Parquet transfers overlap their per-range
+# round-trips instead of streaming on a single connection. Built lazily since
+# boto3 is only available on Amazon deployments.
+_s3_transfer_config = None
+
+def _get_s3_transfer_config():
+    global _s3_transfer_config
+    if _s3_transfer_config is None:
+        from boto3.s3.transfer import TransferConfig
+        _s3_transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=16,
+            use_threads=True,
+        )
+    return _s3_transfer_config
+
+
+# Parent directories already created by _ensure_dir - downloads/uploads of a
+# large backlog land in a handful of directories, so skip the repeated
+# stat+mkdir syscalls after the first file
+_created_dirs = set()
+
+def _ensure_dir(file_path):
+    directory = os.path.dirname(str(file_path))
+    if directory and directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
+
+
+# Azure container clients re-parse the account URL and rebuild pipeline state
+# on every get_container_client call; the service clients in this codebase are
+# long-lived singletons, so reuse one container client per container
+_azure_container_clients = {}
+
+def _get_container_client(client, bucket):
+    key = (id(client), bucket)
+    container_client = _azure_container_clients.get(key)
+    if container_client is None:
+        container_client = client.get_container_client(bucket)
+        _azure_container_clients[key] = container_client
+    return container_client
+
+
 def normalize_object_path(path):
-    path_str = str(path) if not isinstance(path, str) else path
-    return path_str.replace('\\', '/')
+    # Fast path: keys are already forward-slash separated everywhere except
+    # Windows-originated local paths, so skip the replace (and its allocation)
+    return path if '\\' not in path else path.replace('\\', '/')
+
+
+def _is_not_found_error(e):
+    # The per-SDK not-found exception types are not importable across
+    # deployments, so classify from the error itself - probes for optional
+    # config files (events.json, passwords.json, ...) must fail fast instead
+    # of burning download retries
+    if isinstance(e, FileNotFoundError):
+        return True
+    text = str(e)
+    return "404" in text or "Not Found" in text or "NoSuchKey" in text or "BlobNotFound" in text or "does not exist" in text
+
+
+def _retry_transient(action, logger, description):
+    """
+    Run a transfer action, retrying transient failures with a short backoff.
+
+    Attempts are bounded by the DOWNLOAD_MAX_ATTEMPTS environment variable
+    (default 3). Not-found errors are raised immediately so callers probing
+    for optional objects are not slowed down; the final failure is raised to
+    the caller's existing error handling.
+    """
+    attempts = max(1, int(os.environ.get("DOWNLOAD_MAX_ATTEMPTS", "3")))
+    for attempt in range(1, attempts + 1):
+        try:
+            return action()
+        except Exception as e:
+            if attempt >= attempts or _is_not_found_error(e):
+                raise
+            logger.warning(f"Retrying {description} after attempt {attempt} failed: {e}")
+            time.sleep(attempt)
 
 def download_object(cloud, client, bucket, object_path, local_path, logger, supress=False):
     """
@@ -98,17 +182,16 @@ def download_object(cloud, client, bucket, object_path, local_path, logger, supr
     Returns:
         bool: True if download was successful, False otherwise
     """
-    import os
-    from pathlib import Path
-    
     # Normalize object path for cloud providers (but not for Local)
     if cloud != "Local":
         object_path = normalize_object_path(object_path)
     
     if cloud == "Amazon":
         try:
-            # Download the object from S3
-            client.download_file(bucket, object_path, local_path)
+            # Download the object from S3 (concurrent ranged GETs for large objects)
+            _retry_transient(
+                lambda: client.download_file(bucket, object_path, local_path, Config=_get_s3_transfer_config()),
+                logger, f"download of {object_path}")
             if logger and supress == False:
                 logger.info(f"Successfully downloaded {object_path} from {bucket} to {local_path}")
             return True
@@ -124,10 +207,12 @@ def download_object(cloud, client, bucket, object_path, local_path, logger, supr
             blob = gcp_bucket.blob(object_path)
             
             # Make sure the directory exists
-            os.makedirs(os.path.dirname(str(local_path)), exist_ok=True)
+            _ensure_dir(local_path)
             
             # Download the blob
-            blob.download_to_filename(str(local_path))
+            _retry_transient(
+                lambda: blob.download_to_filename(str(local_path)),
+                logger, f"download of {object_path}")
             
             if supress == False:
                 logger.info(f"Downloaded {bucket}/{object_path} to {local_path}")
@@ -138,14 +223,19 @@ def download_object(cloud, client, bucket, object_path, local_path, logger, supr
     elif cloud == "Azure":
         try:
             # Get the container client
-            container_client = client.get_container_client(bucket)
+            container_client = _get_container_client(client, bucket)
             # Get the blob client
             blob_client = container_client.get_blob_client(object_path)
             
-            # Download the blob
-            with open(str(local_path), "wb") as file:
-                download_stream = blob_client.download_blob()
-                file.write(download_stream.readall())
+            # Download the blob, streaming chunks straight into the file -
+            # readall() would first materialize the whole object in memory
+            # (the file is reopened per attempt so a retry starts clean)
+            def download_attempt():
+                with open(str(local_path), "wb") as file:
+                    download_stream = blob_client.download_blob(max_concurrency=16)
+                    download_stream.readinto(file)
+
+            _retry_transient(download_attempt, logger, f"download of {object_path}")
             
             if supress == False:
                 logger.info(f"Downloaded {bucket}/{object_path} to {local_path}")
@@ -155,13 +245,11 @@ def download_object(cloud, client, bucket, object_path, local_path, logger, supr
             return False
     elif cloud == "Local":
         try:
-            import shutil
-            
             # For local storage, simply copy the file
             source_path = os.path.join(bucket, object_path)
             
             # Ensure destination directory exists
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            _ensure_dir(local_path)
             
             # Copy the file
             shutil.copy2(source_path, local_path)
@@ -178,6 +266,105 @@ def download_object(cloud, client, bucket, object_path, local_path, logger, supr
         return False
 
 
+def download_objects_parallel(cloud, client, bucket, object_paths, local_paths, logger, max_workers=32):
+    """
+    Download multiple objects from a cloud storage bucket concurrently.
+
+    Each GET is an independent blocking round-trip, so fanning them out over a
+    thread pool hides the per-object first-byte latency. The storage clients
+    are thread-safe for downloads and are shared across the pool.
+
+    Args:
+        cloud (str): Cloud provider ("Amazon", "Google", "Azure", or "Local")
+        client: Cloud storage client
+        bucket (str): Bucket or container name
+        object_paths (list): Paths of the objects in the bucket
+        local_paths (list): Local destination paths, matching object_paths
+        logger: Logger object for logging messages
+        max_workers (int): Upper bound on concurrent downloads
+
+    Returns:
+        list: List of (object_path, success) tuples in input order
+    """
+    if not object_paths:
+        return []
+
+    def download_one(task):
+        object_path, local_path = task
+        return (object_path, download_object(cloud, client, bucket, object_path, local_path, logger))
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(object_paths))) as executor:
+        return list(executor.map(download_one, zip(object_paths, local_paths)))
+
+
+def download_object_to_bytes(cloud, client, bucket, object_path, logger, supress=False):
+    """
+    Download an object from a cloud storage bucket into memory.
+
+    Args:
+        cloud (str): Cloud provider ("Amazon", "Google", "Azure", or "Local")
+        client: Cloud storage client
+        bucket (str): Bucket or container name
+        object_path (str): Path to the object in the bucket
+        logger: Logger object for logging messages
+
+    Returns:
+        bytes: Object content, or None if the download failed
+    """
+    # Normalize object path for cloud providers (but not for Local)
+    if cloud != "Local":
+        object_path = normalize_object_path(object_path)
+
+    if cloud == "Amazon":
+        try:
+            response = client.get_object(Bucket=bucket, Key=object_path)
+            data = response["Body"].read()
+            if logger and supress == False:
+                logger.info(f"Successfully downloaded {object_path} from {bucket} into memory")
+            return data
+        except Exception as e:
+            if logger:
+                logger.error(f"Failed to download {object_path} from {bucket}: {e}")
+            return None
+    elif cloud == "Google":
+        try:
+            gcp_bucket = client.bucket(bucket)
+            blob = gcp_bucket.blob(object_path)
+            data = blob.download_as_bytes()
+            if supress == False:
+                logger.info(f"Downloaded {bucket}/{object_path} into memory")
+            return data
+        except Exception as e:
+            logger.info(f"Failed to download {bucket}/{object_path}")
+            return None
+    elif cloud == "Azure":
+        try:
+            container_client = _get_container_client(client, bucket)
+            blob_client = container_client.get_blob_client(object_path)
+            data = blob_client.download_blob().readall()
+            if supress == False:
+                logger.info(f"Downloaded {bucket}/{object_path} into memory")
+            return data
+        except Exception as e:
+            logger.info(f"Failed to download {bucket}/{object_path}")
+            return None
+    elif cloud == "Local":
+        try:
+            source_path = os.path.join(bucket, object_path)
+            with open(source_path, "rb") as file:
+                data = file.read()
+            if logger and supress == False:
+                logger.info(f"Read {object_path} from Local storage: {bucket} into memory")
+            return data
+        except Exception as e:
+            if logger:
+                logger.error(f"Failed to read {object_path} from local storage {bucket}: {e}")
+            return None
+    else:
+        logger.error(f"Unsupported cloud provider: {cloud}")
+        return None
+
+
 def upload_object(cloud, client, bucket, object_path, local_path, logger):
     """
     Upload a local file to a cloud storage bucket.
@@ -199,7 +386,8 @@ def upload_object(cloud, client, bucket, object_path, local_path, logger):
     
     if cloud == "Amazon":
         try:
-            client.upload_file(str(local_path), bucket, object_path)
+            # Upload with the shared transfer config (concurrent 8 MiB parts)
+            client.upload_file(str(local_path), bucket, object_path, Config=_get_s3_transfer_config())
             logger.info(f"Uploaded object to {bucket}/{object_path}")
             return True
         except Exception as e:
@@ -209,6 +397,8 @@ def upload_object(cloud, client, bucket, object_path, local_path, logger):
         try:
             gcp_bucket = client.bucket(bucket)
             blob = gcp_bucket.blob(object_path)
+            # 8 MiB resumable-upload chunks instead of the 256 KiB default
+            blob.chunk_size = 8 * 1024 * 1024
             blob.upload_from_filename(str(local_path))
             logger.info(f"Uploaded object to {bucket}/{object_path}")
             return True
@@ -217,10 +407,12 @@ def upload_object(cloud, client, bucket, object_path, local_path, logger):
             return False
     elif cloud == "Azure":
         try:
-            container_client = client.get_container_client(bucket)
+            container_client = _get_container_client(client, bucket)
             blob_client = container_client.get_blob_client(object_path)
+            # Passing the length lets the SDK pick block upload upfront, and
+            # max_concurrency uploads the blocks in parallel
             with open(str(local_path), "rb") as data:
-                blob_client.upload_blob(data, overwrite=True)
+                blob_client.upload_blob(data, overwrite=True, max_concurrency=16, length=os.path.getsize(str(local_path)))
             logger.info(f"Uploaded object to {bucket}/{object_path}")
             return True
         except Exception as e:
@@ -228,15 +420,11 @@ def upload_object(cloud, client, bucket, object_path, local_path, logger):
             return False
     elif cloud == "Local":
         try:
-            import shutil
-            import os
-            from pathlib import Path
-            
             # For local storage, simply copy the file
             dest_path = os.path.join(bucket, object_path)
             
             # Ensure destination directory exists
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            _ensure_dir(dest_path)
             
             # Copy the file
             shutil.copy2(str(local_path), dest_path)
@@ -253,6 +441,95 @@ def upload_object(cloud, client, bucket, object_path, local_path, logger):
         return False
 
 
+def upload_object_from_buffer(cloud, client, bucket, object_path, data, logger):
+    """
+    Upload an in-memory bytes object to a cloud storage bucket.
+
+    Args:
+        cloud (str): Cloud provider ("Amazon", "Google", "Azure", or "Local")
+        client: Cloud storage client
+        bucket (str): Bucket or container name
+        object_path (str): Path to store the object in the bucket
+        data (bytes): Object content to upload
+        logger: Logger object for logging messages
+
+    Returns:
+        bool: True if upload was successful, False otherwise
+    """
+    # Normalize object path for cloud providers (but not for Local)
+    if cloud != "Local":
+        object_path = normalize_object_path(object_path)
+
+    if cloud == "Amazon":
+        try:
+            client.put_object(Bucket=bucket, Key=object_path, Body=data)
+            logger.info(f"Uploaded object to {bucket}/{object_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upload object to {bucket}/{object_path}: {e}")
+            return False
+    elif cloud == "Google":
+        try:
+            gcp_bucket = client.bucket(bucket)
+            blob = gcp_bucket.blob(object_path)
+            blob.upload_from_string(data)
+            logger.info(f"Uploaded object to {bucket}/{object_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upload object to {bucket}/{object_path}: {e}")
+            return False
+    elif cloud == "Azure":
+        try:
+            container_client = _get_container_client(client, bucket)
+            blob_client = container_client.get_blob_client(object_path)
+            blob_client.upload_blob(data, overwrite=True)
+            logger.info(f"Uploaded object to {bucket}/{object_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to upload object to {bucket}/{object_path}: {e}")
+            return False
+    elif cloud == "Local":
+        try:
+            # For local storage, write the bytes directly to the bucket path
+            dest_path = os.path.join(bucket, object_path)
+
+            # Ensure destination directory exists
+            _ensure_dir(dest_path)
+
+            with open(dest_path, "wb") as file:
+                file.write(data)
+
+            if logger:
+                logger.info(f"Uploaded buffer to Local storage: {dest_path}")
+            return True
+        except Exception as e:
+            if logger:
+                logger.error(f"Failed to upload buffer to local storage {bucket}/{object_path}: {e}")
+            return False
+    else:
+        logger.error(f"Unsupported cloud provider: {cloud}")
+        return False
+
+
+# Recursively yield standardized object dicts for files under dir_path,
+# filtered by the lower-cased prefix (matched case-insensitively against the
+# bucket-relative path, like the cloud listings)
+def _iter_local_objects(dir_path, base_len, prefix_lower):
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_local_objects(entry.path, base_len, prefix_lower)
+            elif entry.is_file():
+                rel_path = entry.path[base_len:].replace(os.sep, '/')
+                if not prefix_lower or rel_path.lower().startswith(prefix_lower):
+                    stat_result = entry.stat()
+                    yield {
+                        "name": rel_path,
+                        "size": stat_result.st_size,
+                        "last_modified": stat_result.st_mtime
+                    }
+
+
 def list_objects(cloud, client, bucket, logger, prefix="", supress=False):
     """
     List objects in a cloud storage bucket.
@@ -270,16 +547,17 @@ def list_objects(cloud, client, bucket, logger, prefix="", supress=False):
     """
     if cloud == "Amazon":
         try:
-            response = client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-            if supress == False:
-                logger.info(f"Listed objects in {bucket} with prefix {prefix}")
-            
-            # Convert AWS-specific response to standardized format
+            # Paginate - a single list_objects_v2 call silently caps the
+            # result at 1000 keys
             result = []
-            if "Contents" in response:
-                for item in response["Contents"]:
+            paginator = client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for item in page.get("Contents", ()):
                     result.append({"name": item["Key"], "size": item["Size"], "last_modified": item["LastModified"]})
-            
+
+            if supress == False:
+                logger.info(f"Listed objects in {bucket} with prefix {prefix}")
+
             return {"objects": result}
         except Exception as e:
             logger.error(f"Failed to list objects in {bucket} with prefix {prefix}: {e}")
@@ -304,7 +582,7 @@ def list_objects(cloud, client, bucket, logger, prefix="", supress=False):
             return {"objects": []}
     elif cloud == "Azure":
         try:
-            container_client = client.get_container_client(bucket)
+            container_client = _get_container_client(client, bucket)
             result = []
             blobs = container_client.list_blobs(name_starts_with=prefix)
             for blob in blobs:
@@ -322,28 +600,13 @@ def list_objects(cloud, client, bucket, logger, prefix="", supress=False):
             return {"objects": []}
     elif cloud == "Local":
         try:
-            from pathlib import Path
-            import os
-            
-            response = {"objects": []}
-            bucket_path = Path(bucket)
-            
-            # For Local storage, handle prefix filtering differently
-            # We need to walk the directory and filter files by prefix at the filename level
-            for root, _, files in os.walk(bucket_path):
-                for file in files:
-                    file_path = Path(root) / file
-                    # Convert to relative path from bucket
-                    rel_path = str(file_path.relative_to(bucket_path)).replace('\\', '/')
-                    
-                    # If prefix is specified, check if the filename (not just path) starts with the prefix
-                    if not prefix or rel_path.lower().startswith(prefix.lower()):
-                        response["objects"].append({
-                            "name": rel_path,
-                            "size": file_path.stat().st_size,
-                            "last_modified": file_path.stat().st_mtime
-                        })
-                        
+            # Single recursive scandir pass - the DirEntry stat data is cached
+            # from the directory read, so this costs one getdents per
+            # directory instead of two stat syscalls per file
+            base_len = len(os.path.join(str(bucket), ""))
+            prefix_lower = prefix.lower() if prefix else ""
+            response = {"objects": list(_iter_local_objects(str(bucket), base_len, prefix_lower))}
+
             if logger and supress == False:
                 logger.info(f'Listed {len(response["objects"])} objects in {bucket} with prefix {prefix}')
             return response
@@ -356,123 +619,93 @@ def list_objects(cloud, client, bucket, logger, prefix="", supress=False):
         return {"objects": []}
 
 
-def list_objects_with_pagination(cloud, client, bucket, logger, prefix="", supress=False):
+def list_objects_with_pagination(cloud, client, bucket, logger, prefix="", supress=False, page_filter=None, max_results=None):
     """
     List objects in a cloud storage bucket with pagination support for >1000 objects.
-    
+
     Args:
         cloud (str): Cloud provider ("Amazon", "Google", "Azure", or "Local")
         client: Cloud storage client
         bucket (str): Bucket or container name
         logger: Logger object for logging messages
         prefix (str): Object prefix to filter results
-        
+        page_filter: Optional predicate called with each object name - objects it
+                     rejects are discarded per page instead of being accumulated
+        max_results (int): Optional cap on accumulated objects - pagination stops
+                           once reached instead of fetching remaining pages
+
     Returns:
         dict: Standardized response with 'objects' key containing a list of all object dictionaries
               with 'name' and other metadata, or an empty list if no objects or error
     """
     all_objects = []
-    
+
     if cloud == "Amazon":
         try:
-            # Initialize pagination variables
-            continuation_token = None
-            is_truncated = True
-            
-            while is_truncated:
-                # Set up the list_objects_v2 parameters
-                params = {"Bucket": bucket, "Prefix": prefix}
-                if continuation_token:
-                    params["ContinuationToken"] = continuation_token
-                
-                # Call the API
-                response = client.list_objects_v2(**params)
-                
-                # Process the results
-                if "Contents" in response:
-                    for item in response["Contents"]:
-                        all_objects.append({
-                            "name": item["Key"], 
-                            "size": item["Size"], 
-                            "last_modified": item["LastModified"]
-                        })
-                
-                # Check if there are more results
-                is_truncated = response.get("IsTruncated", False)
-                continuation_token = response.get("NextContinuationToken", None)
-            
+            # The boto3 paginator handles the continuation tokens and reuses
+            # the connection across pages
+            paginator = client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for item in page.get("Contents", ()):
+                    if page_filter is not None and not page_filter(item["Key"]):
+                        continue
+                    all_objects.append({
+                        "name": item["Key"],
+                        "size": item["Size"],
+                        "last_modified": item["LastModified"]
+                    })
+
+                # Stop fetching further pages once the caller's budget is met
+                if max_results is not None and len(all_objects) >= max_results:
+                    return {"objects": all_objects[:max_results]}
+
             return {"objects": all_objects}
-            
+
         except Exception as e:
             logger.error(f"Failed to list objects in {bucket} with prefix {prefix}: {e}")
             return {"objects": []}
-            
+
     elif cloud == "Google":
         try:
-            # Initialize pagination variables
-            page_token = None
+            # The blob iterator paginates lazily, so stopping early at
+            # max_results also stops fetching pages
             gcp_bucket = client.bucket(bucket)
-            
-            # Loop until all pages are processed
-            while True:
-                # Get a page of results
-                blobs = gcp_bucket.list_blobs(prefix=prefix, page_token=page_token)
-                
-                # Process the current page
-                current_batch = list(blobs)
-                for blob in current_batch:
-                    all_objects.append({
-                        "name": blob.name,
-                        "size": blob.size,
-                        "last_modified": blob.updated
-                    })
-                
-                # Check if there are more pages
-                page_token = blobs.next_page_token
-                if not page_token:
+            for blob in gcp_bucket.list_blobs(prefix=prefix):
+                if page_filter is not None and not page_filter(blob.name):
+                    continue
+                all_objects.append({
+                    "name": blob.name,
+                    "size": blob.size,
+                    "last_modified": blob.updated
+                })
+                if max_results is not None and len(all_objects) >= max_results:
                     break
-            
+
             return {"objects": all_objects}
-            
+
         except Exception as e:
             logger.error(f"Failed to list objects in GCP bucket {bucket} with prefix {prefix}: {e}")
             return {"objects": []}
-            
+
     elif cloud == "Azure":
         try:
-            # Initialize the container client and pagination variables
-            container_client = client.get_container_client(bucket)
-            continuation_token = None
-            
-            # Loop until all pages are processed
-            while True:
-                # Get a page of results
-                blobs_page = container_client.list_blobs(
-                    name_starts_with=prefix,
-                    results_per_page=1000,
-                    marker=continuation_token
-                )
-                
-                # Convert to a list so we can check its length and get the last item
-                current_batch = list(blobs_page)
-                
-                # Process the current page
-                for blob in current_batch:
-                    all_objects.append({
-                        "name": blob.name,
-                        "size": blob.size,
-                        "last_modified": blob.last_modified
-                    })
-                
-                # Check if we've reached the end
-                if not current_batch or len(current_batch) < 1000:
+            # The blob iterator tracks the continuation token itself - the
+            # previous hand-rolled loop used the last blob name as marker and
+            # stopped on pages shorter than 1000, which could both misbehave
+            container_client = _get_container_client(client, bucket)
+            for blob in container_client.list_blobs(name_starts_with=prefix, results_per_page=1000):
+                if page_filter is not None and not page_filter(blob.name):
+                    continue
+                all_objects.append({
+                    "name": blob.name,
+                    "size": blob.size,
+                    "last_modified": blob.last_modified
+                })
+                if max_results is not None and len(all_objects) >= max_results:
                     break
-                    
-                # Update the continuation token for the next page
-                continuation_token = current_batch[-1].name
-            
+
             return {"objects": all_objects}
-            
+
         except Exception as e:
             logger.error(f"Failed to list objects in Azure container {bucket} with prefix {prefix}: {e}")
             return {"objects": []}
@@ -480,7 +713,13 @@ def list_objects_with_pagination(cloud, client, bucket, logger, prefix="", supre
         try:
             # For Local storage, just use the regular list_objects function
             # as pagination isn't typically needed for local filesystem operations
-            return list_objects(cloud, client, bucket, logger, prefix, supress)
+            response = list_objects(cloud, client, bucket, logger, prefix, supress)
+            objects = response["objects"]
+            if page_filter is not None:
+                objects = [obj for obj in objects if page_filter(obj["name"])]
+            if max_results is not None:
+                objects = objects[:max_results]
+            return {"objects": objects}
         except Exception as e:
             logger.error(f"Failed to list objects in {bucket} with prefix {prefix}: {e}")
             return {"objects": []}
@@ -489,6 +728,58 @@ def list_objects_with_pagination(cloud, client, bucket, logger, prefix="", supre
         return {"objects": []}
 
 
+def iter_objects(cloud, client, bucket, logger, prefix=""):
+    """
+    Iterate objects in a cloud storage bucket page by page.
+
+    Yields the same standardized object dictionaries as
+    list_objects_with_pagination ('name', 'size', 'last_modified'), but one at
+    a time so callers can process and discard each page instead of holding the
+    full listing in memory. Errors are logged and end the iteration.
+
+    Args:
+        cloud (str): Cloud provider ("Amazon", "Google", "Azure", or "Local")
+        client: Cloud storage client
+        bucket (str): Bucket or container name
+        logger: Logger object for logging messages
+        prefix (str): Object prefix to filter results
+    """
+    if cloud == "Amazon":
+        try:
+            paginator = client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for item in page.get("Contents", ()):
+                    yield {"name": item["Key"], "size": item["Size"], "last_modified": item["LastModified"]}
+        except Exception as e:
+            logger.error(f"Failed to list objects in {bucket} with prefix {prefix}: {e}")
+    elif cloud == "Google":
+        try:
+            # The blob iterator fetches pages lazily as it is consumed
+            gcp_bucket = client.bucket(bucket)
+            for blob in gcp_bucket.list_blobs(prefix=prefix):
+                yield {"name": blob.name, "size": blob.size, "last_modified": blob.updated}
+        except Exception as e:
+            logger.error(f"Failed to list objects in GCP bucket {bucket} with prefix {prefix}: {e}")
+    elif cloud == "Azure":
+        try:
+            # The blob iterator fetches pages lazily as it is consumed
+            container_client = _get_container_client(client, bucket)
+            for blob in container_client.list_blobs(name_starts_with=prefix, results_per_page=1000):
+                yield {"name": blob.name, "size": blob.size, "last_modified": blob.last_modified}
+        except Exception as e:
+            logger.error(f"Failed to list objects in Azure container {bucket} with prefix {prefix}: {e}")
+    elif cloud == "Local":
+        response = list_objects(cloud, client, bucket, logger, prefix)
+        for obj in response["objects"]:
+            yield obj
+    else:
+        logger.error(f"Unsupported cloud provider: {cloud}")
+
+
+# Single-pass subject sanitization for the SNS DeduplicationId (spaces to
+# underscores, pipes dropped)
+_SNS_SUBJECT_SANITIZE = str.maketrans({' ': '_', '|': None})
+
 def publish_notification(cloud, client, subject, message, logger):
     """
     Publish a notification to a cloud messaging service.
@@ -504,14 +795,13 @@ def publish_notification(cloud, client, subject, message, logger):
     Returns:
         bool: True if notification was published successfully, False otherwise
     """
-    import os
     if cloud == "Amazon":
-        if client == None or client == False:
+        if client is None or client is False:
             logger.info(f"- No message client available")
             return False
-        
+
         target = os.environ.get("SNS_ARN", "NONE")
-        message_attributes = {'DeduplicationId': {'DataType': 'String','StringValue': subject.replace(' ', '_').replace("|","")}} 
+        message_attributes = {'DeduplicationId': {'DataType': 'String','StringValue': subject.translate(_SNS_SUBJECT_SANITIZE)}}
         try:
             response = client.publish(
                 TopicArn=target,
@@ -1,7 +1,7 @@
 # This function includes the custom logic for creating calculated signals
 # You can update/extend the logic as needed - or use one of the existing examples
 def apply_custom_function(df_messages, function, download_objects=None):   
-    from .utils import check_geofence
+    from .utils import check_geofences_vectorized
     import json
     
     # Example 1: Combine multiple DM01 messages into a single message incl. the SA and 'final' SPN    
@@ -28,7 +28,7 @@ def apply_custom_function(df_messages, function, download_objects=None):
             download_objects.logger.error(f"Error loading geofences.json: {str(e)}")
             raise
         
-        df_messages["GeofenceId"] = df_messages.apply(check_geofence, axis=1, args=("Latitude", "Longitude", geofences))
+        df_messages["GeofenceId"] = check_geofences_vectorized(df_messages, "Latitude", "Longitude", geofences)
         signals_to_include = ["GeofenceId"]
         df_messages = df_messages[signals_to_include]
         df_messages = df_messages[(df_messages.notnull()).any(axis=1)]
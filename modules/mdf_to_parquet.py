@@ -16,7 +16,10 @@ def mdf_to_parquet(cloud, storage_client, notification_client, event, bucket_inp
     if len(log_file_object_paths) == 0:
         return False 
     
-    with tempfile.TemporaryDirectory() as temp:       
+    # Place the working directories under MDF_SCRATCH when set (e.g. a tmpfs
+    # mount such as /dev/shm on container deployments), so the decoder ->
+    # custom/event -> upload parquet traffic never touches disk
+    with tempfile.TemporaryDirectory(dir=os.environ.get("MDF_SCRATCH")) as temp:
         tmp_input_dir = Path(temp) / "input"
         tmp_input_mdf_dir = Path(temp) / "input" / "logfiles"
         tmp_output_dir = Path(temp) / "output"     
@@ -36,9 +39,10 @@ def mdf_to_parquet(cloud, storage_client, notification_client, event, bucket_inp
         dbc_result = do.download_dbc_files(device_dbc_list)
         if dbc_result:  
             do.download_password_file()
-            for log_file_object_path in log_file_object_paths:             
-                do.download_log_file(log_file_object_path)
-                
+            # Download the batch's log files in parallel - per-object GET
+            # latency dominates large backlog batches when done one at a time
+            do.download_log_files(log_file_object_paths)
+
             # DBC decode MDF data to Parquet files
             logger.info(f"\n\nDBC DECODE MDF TO PARQUET")
             decoder_result = decode_log_file(decoder, tmp_input_dir, tmp_output_dir, logger)
@@ -1,4 +1,56 @@
-from .cloud_functions import download_object, list_objects, list_objects_with_pagination, upload_object, publish_notification
+from .cloud_functions import download_object, download_objects_parallel, iter_objects, list_objects, upload_object, publish_notification
+from .mdf_to_parquet import mdf_to_parquet
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# CANedge device IDs are 8 hex characters - compiled once at module load
+_DEVICE_ID_RE = re.compile(r"[0-9A-F]{8}$")
+
+# Backlog prefix shapes - compiled once instead of passing string patterns to
+# re.match inside the per-entry and per-object loops
+_DEVICE_PREFIX_RE = re.compile(r"^[0-9A-F]{8}/$")
+_SESSION_PREFIX_RE = re.compile(r"^[0-9A-F]{8}/[0-9]{8}/$")
+
+# Valid CANedge log file extensions (upper-cased, including the dot)
+_VALID_EXTENSIONS = frozenset({".MF4", ".MFC", ".MFE", ".MFM"})
+
+# -----------------------------------------------
+# Short-lived TTL cache for listings of rarely-changing prefixes (e.g. the DBC
+# inventory) - warm invocations reusing the same runtime skip the repeated LIST
+_list_objects_cache = {}
+_list_objects_cache_lock = threading.Lock()
+
+def _cached_list_objects(cloud, storage_client, bucket, logger, prefix, ttl=60):
+    key = (bucket, prefix)
+    with _list_objects_cache_lock:
+        cached = _list_objects_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+    response = list_objects(cloud, storage_client, bucket, logger, prefix)
+    with _list_objects_cache_lock:
+        _list_objects_cache[key] = (time.monotonic(), response)
+
+    return response
+
+# -----------------------------------------------
+# Short-lived TTL cache for the small root config files (custom-messages.json,
+# events.json, passwords.json, ...) - backlog/container runs probe these once
+# per processed log file, and both content and absence can be reused instead
+# of re-downloading (or re-failing) the GET every time
+_config_file_cache = {}
+_config_file_cache_lock = threading.Lock()
+_CONFIG_FILE_CACHE_TTL = 60
 
 # Class for downloading objects required by the Lambda
 class DownloadObjects:
@@ -13,13 +65,11 @@ class DownloadObjects:
     # -----------------------------------------------
     # Extract device ID (note: Only works if the CANedge S3 file structure is used)
     def extract_device_id(self):
-        import re
-        
         device_id = ""
-        parts = self.log_file_object_path.parts
-        
+        parts = str(self.log_file_object_path).split('/')
+
         # Check if the path has at least 3 parts and 1st part matches device ID syntax
-        if len(parts) == 3 and re.match("[0-9A-F]{8}$", parts[0]):
+        if len(parts) == 3 and _DEVICE_ID_RE.match(parts[0]):
             # The device_id is expected to be the first part of the path
             device_id = parts[0]
             self.logger.info(f"Device ID: {device_id}")
@@ -31,8 +81,6 @@ class DownloadObjects:
     # -----------------------------------------------    
     # Download dbc-groups.json file (if it exists) and use device ID to extract relevant DBC list
     def get_device_dbc_list(self,device_id):
-        import json 
-        
         # If no match is found, the script simply applies all DBC files across any device ID
         device_dbc_list = [] 
         if device_id != "":
@@ -72,18 +120,28 @@ class DownloadObjects:
     def download_dbc_files(self, device_dbc_files):
         dbc_files = []
         result = True
-        
+
+        # Download one DBC object (used by the download pool below)
+        def download_one(dbc_object_name):
+            local_path = self.tmp_input_dir / dbc_object_name
+            download_object(self.cloud, self.storage_client, self.bucket_input, dbc_object_name, str(local_path), self.logger)
+
         for type in ["can", "lin"]:
             try:
-                response = list_objects(self.cloud, self.storage_client, self.bucket_input, self.logger, type)
-                
-                # Process the standardized response format
+                response = _cached_list_objects(self.cloud, self.storage_client, self.bucket_input, self.logger, type)
+
+                # Collect the matching DBC objects first, then download them in
+                # parallel - each download is an independent blocking GET
+                type_dbc_files = []
                 for object_info in response["objects"]:
                     dbc_object_name = object_info["name"]
                     if dbc_object_name.endswith(".dbc") and (len(device_dbc_files) == 0 or dbc_object_name in device_dbc_files):
-                        local_path = self.tmp_input_dir / dbc_object_name
-                        download_object(self.cloud, self.storage_client, self.bucket_input, dbc_object_name, str(local_path), self.logger)
-                        dbc_files.append(dbc_object_name)
+                        type_dbc_files.append(dbc_object_name)
+
+                if type_dbc_files:
+                    with ThreadPoolExecutor(max_workers=min(16, len(type_dbc_files))) as executor:
+                        list(executor.map(download_one, type_dbc_files))
+                    dbc_files.extend(type_dbc_files)
             except Exception as e:
                 self.logger.error(f"Unable to list or download DBC files from {self.bucket_input}:\n {e}")
                 result = False
@@ -100,13 +158,8 @@ class DownloadObjects:
     # -----------------------------------------------
     # Download trigger log file
     def download_log_file(self, log_file_object_path):
-        from pathlib import Path
-        
-        # Convert to Path if it's not already
-        path_obj = log_file_object_path if isinstance(log_file_object_path, Path) else Path(str(log_file_object_path))
-        
         # Create unique filename by replacing separators with underscores
-        unique_name = str(path_obj).replace('/', '_').replace('\\', '_')
+        unique_name = str(log_file_object_path).replace('/', '_').replace('\\', '_')
         
         # Create destination path
         fs_file_path = self.tmp_input_dir / "logfiles" / unique_name
@@ -114,39 +167,72 @@ class DownloadObjects:
         # Download the object
         download_object(self.cloud, self.storage_client, self.bucket_input, str(log_file_object_path), str(fs_file_path), self.logger)
 
-    # -----------------------------------------------   
+    # -----------------------------------------------
+    # Download all trigger log files for the invocation in parallel
+    def download_log_files(self, log_file_object_paths):
+        object_paths = [str(log_file_object_path) for log_file_object_path in log_file_object_paths]
+
+        # Create unique filenames by replacing separators with underscores
+        local_paths = [str(self.tmp_input_dir / "logfiles" / object_path.replace('/', '_').replace('\\', '_'))
+                       for object_path in object_paths]
+
+        download_objects_parallel(self.cloud, self.storage_client, self.bucket_input, object_paths, local_paths, self.logger)
+
+    # -----------------------------------------------
     # Download passwords.json file if needed
     def download_password_file(self):
-        if str(self.log_file_object_path).split(".")[-1] in ["MFE","MFM"]:   
+        if str(self.log_file_object_path).split(".")[-1] in ["MFE","MFM"]:
             object_path = "passwords.json"
             fs_file_path = self.tmp_input_dir / object_path
-            download_object(self.cloud, self.storage_client, self.bucket_input, object_path, str(fs_file_path), self.logger)
+            cache_key = (self.cloud, self.bucket_input, object_path)
+
+            # Reuse the cached file content (or cached absence) when fresh -
+            # the decoder reads the passwords from disk, so rewrite it locally
+            with _config_file_cache_lock:
+                cached = _config_file_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < _CONFIG_FILE_CACHE_TTL:
+                if cached[1] is not None:
+                    fs_file_path.write_bytes(cached[1])
+                return
+
+            object_found = download_object(self.cloud, self.storage_client, self.bucket_input, object_path, str(fs_file_path), self.logger)
+            file_content = fs_file_path.read_bytes() if object_found else None
+            with _config_file_cache_lock:
+                _config_file_cache[cache_key] = (time.monotonic(), file_content)
             
     # -----------------------------------------------   
     # Check for and download JSON file if it exists
     def download_json_file(self, object_path):
-        import json
+        cache_key = (self.cloud, self.bucket_input, object_path)
+
+        # Return the cached parsed JSON (or cached absence) when fresh
+        with _config_file_cache_lock:
+            cached = _config_file_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _CONFIG_FILE_CACHE_TTL:
+            return cached[1]
 
         fs_json_file_path = self.tmp_input_dir / object_path
         object_found = download_object(self.cloud, self.storage_client, self.bucket_input, object_path, str(fs_json_file_path), self.logger)
 
         if object_found == False:
-            return []
-        
-        try:
-            with open(fs_json_file_path, 'r') as f:
-                json_data = json.load(f)
-                return json_data
-        except Exception as e:
-            self.logger.info(f"{object_path} found in {self.bucket_input}, but the JSON appears invalid: {str(e)}")
-            return []
+            json_data = []
+        else:
+            try:
+                with open(fs_json_file_path, 'r') as f:
+                    json_data = json.load(f)
+            except Exception as e:
+                self.logger.info(f"{object_path} found in {self.bucket_input}, but the JSON appears invalid: {str(e)}")
+                json_data = []
+
+        with _config_file_cache_lock:
+            _config_file_cache[cache_key] = (time.monotonic(), json_data)
+
+        return json_data
         
 
 # -----------------------------------------------
 # DBC decode MDF file to Parquet via MF4 decoder
 def decode_log_file(decoder, tmp_input_dir, tmp_output_dir, logger):
-    import subprocess, os, shutil
-    
     fs_logfiles_path = tmp_input_dir / "logfiles" 
     
     # Check if the logfiles folder contains any files
@@ -161,12 +247,19 @@ def decode_log_file(decoder, tmp_input_dir, tmp_output_dir, logger):
     else:
         shutil.copy("./" + decoder, tmp_input_dir)    
     
-    subprocess.run([os.path.join(tmp_input_dir, decoder), "-v"], cwd=str(tmp_input_dir),)
-    subprocess_result = subprocess.run([os.path.join(tmp_input_dir, decoder),"-i",str(fs_logfiles_path),"-O",str(tmp_output_dir), "--verbosity=1","-X",],cwd=str(tmp_input_dir),)
-            
+    # Discard the decoder's per-file stdout chatter (writes through the runtime
+    # log pipe can stall the subprocess) and only keep stderr for diagnostics
+    subprocess_result = subprocess.run(
+        [os.path.join(tmp_input_dir, decoder), "-i", str(fs_logfiles_path), "-O", str(tmp_output_dir), "--verbosity=1", "-X"],
+        cwd=str(tmp_input_dir),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+
     if subprocess_result.returncode != 0:
-        logger.error(f"MF4 decoding failed (returncode {subprocess_result.returncode})")
-        result = False 
+        stderr_output = subprocess_result.stderr.decode(errors="replace").strip()
+        logger.error(f"MF4 decoding failed (returncode {subprocess_result.returncode}): {stderr_output}")
+        result = False
     else:
         logger.info(f"MF4 decoding created {len(list(tmp_output_dir.rglob('*.*'))) } Parquet files")
         result = True 
@@ -190,17 +283,16 @@ class CreateCustomMessages:
             
         import pyarrow as pa
         import pyarrow.parquet as pq
-        from pathlib import Path
         from .custom_message_functions import apply_custom_function
         
         # List all decoded Parquet files and message paths
         decoded_files = list(self.tmp_output_dir.rglob("*.parquet"))
-        all_message_paths = get_all_message_paths(decoded_files)
+        all_message_paths, message_to_keys = get_all_message_paths(decoded_files)
 
         # Loop through each custom message
         for idx, custom_message in enumerate(custom_messages, start=1):
             custom_message_name = custom_message["custom_message_name"]
-            messages_filtered_list = get_messages_filtered_list(self.tmp_output_dir, custom_message)
+            messages_filtered_list = get_messages_filtered_list(decoded_files, custom_message)
             self.logger.info(f"Processing custom message {idx}/{len(custom_messages)}: {custom_message_name}")
             self.logger.info(f"- Input messages: {messages_filtered_list}")
             
@@ -208,30 +300,38 @@ class CreateCustomMessages:
             for messages_filtered in messages_filtered_list:
                 
                 # Extract list of related decoded message file paths
-                related_message_paths = get_related_message_paths(all_message_paths, messages_filtered)
+                related_message_paths = get_related_message_paths(all_message_paths, message_to_keys, messages_filtered)
 
                 if len(related_message_paths) == 0:
                     self.logger.info(f"- No matching decoded files found: {messages_filtered}")
                     continue
                 
-                # Loop through each unique path per set of related messages
-                for (device, date, file_name), messages in related_message_paths.items():           
-                
+                # Process each unique path per set of related messages - the
+                # tuples are independent load -> transform -> write pipelines,
+                # so they run in parallel
+                def process_path(task):
+                    (device, date, file_name), messages = task
+
                     # Load message data. If empty, skip
-                    df_messages = self.create_df_messages(messages, device, date, file_name, custom_message)     
+                    df_messages = self.create_df_messages(messages, device, date, file_name, custom_message)
                     if df_messages.empty:
                         self.logger.info(f"- Decoded file found, but data frame is empty (typically due to short file): {(messages_filtered, device, date, file_name)}")
-                        continue 
-                    
-                    # Update data frame by applying apply custom functions 
+                        return
+
+                    # Update data frame by applying apply custom functions
                     df_messages = apply_custom_function(df_messages, custom_message["function"], self.download_objects)
-                                      
-                    # Write the new custom file as Parquet to unique path                     
-                    custom_file = self.tmp_output_dir / device / custom_message_name / date / file_name 
+
+                    # Write the new custom file as Parquet to unique path
+                    custom_file = self.tmp_output_dir / device / custom_message_name / date / file_name
                     Path(custom_file).parent.mkdir(parents=True, exist_ok=True)
                     table = pa.Table.from_pandas(df_messages.reset_index())
-                    pq.write_table(table, custom_file)  
-                    self.logger.info(f"- Wrote custom Parquet file to {custom_file}")               
+                    # ZSTD shrinks the payload ~30-50% vs the snappy default at
+                    # similar write CPU - these files go straight to upload
+                    pq.write_table(table, custom_file, compression="zstd", compression_level=1)
+                    self.logger.info(f"- Wrote custom Parquet file to {custom_file}")
+
+                with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                    list(executor.map(process_path, related_message_paths.items()))
 
     # -----------------------------------------------
     # create_custom_messages helper function: Extract input message data 
@@ -241,7 +341,7 @@ class CreateCustomMessages:
         dfs = []
         for message in messages:
             decoded_file = self.tmp_output_dir / device / message / date / file_name
-            df = load_parquet_to_df(decoded_file, message, custom_message["raster"], custom_message["prefix"])
+            df = load_parquet_to_df(decoded_file, message, custom_message["raster"], custom_message["prefix"], columns=custom_message.get("columns"))
             df["Message"] = message
             dfs.append(df)
         
@@ -273,10 +373,9 @@ class DetectEvents:
             self.logger.info("No valid events.json found - skipping this step")
             return 
             
-        import pyarrow as pa
+        import numpy as np
         import pyarrow.parquet as pq
-        from pathlib import Path
-        
+
         # Extract events list and general configuration
         general_cfg = events.get("general", {})
         events_cfg = events.get("events", [])
@@ -290,63 +389,75 @@ class DetectEvents:
         
         # List all decoded Parquet files and message paths
         decoded_files = list(self.tmp_output_dir.rglob("*.parquet"))
-        all_message_paths = get_all_message_paths(decoded_files)
-        
+        all_message_paths, message_to_keys = get_all_message_paths(decoded_files)
+
         # Loop through each event
         for idx, event in enumerate(events_cfg, start=1):
             event_name = event["event_name"]   
-            messages_filtered_list = get_messages_filtered_list(self.tmp_output_dir, event)[0]
+            messages_filtered_list = get_messages_filtered_list(decoded_files, event)[0]
 
             self.logger.info(f"Processing event {idx}/{len(events_cfg)}: {event_name}")
             self.logger.info(f"- Input messages: {messages_filtered_list}")
             message_sent = False
-                        
+            message_lock = threading.Lock()
+
             # Loop through each input message per event 
             # Note: The use of [0] forces the script to evaluate lists of messages one-by-one
             for messages_filtered in messages_filtered_list:
                 messages_filtered = [messages_filtered]
                 
                 # Extract list of related decoded message file paths
-                related_message_paths = get_related_message_paths(all_message_paths, messages_filtered)
+                related_message_paths = get_related_message_paths(all_message_paths, message_to_keys, messages_filtered)
                 if len(related_message_paths) == 0:
                     self.logger.info(f"- No matching decoded files found: {messages_filtered}")
                     continue
                                                         
-                # Loop through each unique path per set of related messages
-                for (device, date, file_name), messages in related_message_paths.items():           
-                                        
+                # Process each unique path per set of related messages - the
+                # tuples are independent load -> detect -> write pipelines, so
+                # they run in parallel (only the notification flag is shared)
+                def process_path(task):
+                    nonlocal message_sent
+                    (device, date, file_name), messages = task
+
                     # Load message data. If empty, skip
                     df_messages = self.create_df_messages(messages, device, date, file_name, event, messages_gps, include_gps_data)
                     if df_messages.empty:
                         self.logger.info(f"- Decoded file found, but data frame is empty (typically due to short file): {(messages_filtered, device, date, file_name)}")
-                        continue 
-                
+                        return
+
                     # Loop through each trigger signal for the event
                     for trigger_signal in event["trigger_signals"]:
-                        
+
                         # Test if trigger signal value crosses event thresholds. If so, extract the start/stop event-related subset of data. If empty, skip
-                        df_signal_event = self.create_df_signal_event(trigger_signal, event, df_messages)                      
+                        df_signal_event = self.create_df_signal_event(trigger_signal, event, df_messages)
                         if df_signal_event.empty:
                             self.logger.info(f"- No events found: {(messages_filtered, trigger_signal, device, date, file_name)}")
-                            pass           
+                            pass
                         else:
                             # Add the event data to the consistent event meta data structure
-                            df_signal_event_meta, schema = self.create_df_signal_event_meta(df_signal_event, trigger_signal, event_name, device, messages, include_gps_data, signal_latitude, signal_longitude)
-                            
-                            # Write the new custom file as Parquet to unique path 
+                            table = self.create_signal_event_meta_table(df_signal_event, trigger_signal, event_name, device, messages, include_gps_data, signal_latitude, signal_longitude)
+
+                            # Write the new custom file as Parquet to unique path
                             custom_file = self.tmp_output_dir / "aggregations" / "events" / date / (device + "_" + messages[0] + "_" + trigger_signal + "_" + event_name + "_"+ file_name)
                             Path(custom_file).parent.mkdir(parents=True, exist_ok=True)
-                            table = pa.Table.from_pandas(df_signal_event_meta.reset_index(), schema=schema)
-                            pq.write_table(table, custom_file)  
+                            pq.write_table(table, custom_file, compression="zstd", compression_level=1)
                             self.logger.info(f"- Wrote event Parquet file to {custom_file}")
-                            
+
                             # Upon first identified 'rising edge' event, publish message to SNS topic
-                            df_start_events = df_signal_event_meta[df_signal_event_meta["EventValue"] == 1]
+                            start_rows = np.flatnonzero(table.column("EventValue").to_numpy() == 1)
+
+                            if start_rows.size > 0:
+                                start_time = table.column("t")[int(start_rows[0])].as_py()
+                                # Check-and-set under the lock so only the first
+                                # path to find a start event notifies
+                                with message_lock:
+                                    if message_sent == False:
+                                        subject = f"- EVENT: {event_name} | {device} | {start_time}"
+                                        body = f"{event_name} was triggered. {static_body_content}\n\nDetails:\n- device: {device}\n- message(s): {messages_filtered}\n- file: {file_name}\n- time: {start_time}"
+                                        message_sent = self.publish_message(subject, body)
 
-                            if message_sent == False and df_start_events.empty == False:
-                                subject = f"- EVENT: {event_name} | {device} | {df_start_events.index[0]}"
-                                body = f"{event_name} was triggered. {static_body_content}\n\nDetails:\n- device: {device}\n- message(s): {messages_filtered}\n- file: {file_name}\n- time: {df_start_events.index[0]}"
-                                message_sent = self.publish_message(subject, body)
+                with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                    list(executor.map(process_path, related_message_paths.items()))
             
     # -----------------------------------------------
     # process_events helper function: Send message to SNS topic for use in event notification
@@ -366,7 +477,8 @@ class DetectEvents:
         
         for message in messages:
             decoded_file = self.tmp_output_dir / device / message / date / file_name
-            dfs.append(load_parquet_to_df(decoded_file, message, event["raster"]))
+            # Only the trigger signals are evaluated from the event messages
+            dfs.append(load_parquet_to_df(decoded_file, message, event["raster"], columns=event["trigger_signals"]))
         
         # If GPS position data is to be included, try to extract this
         if include_gps_data:
@@ -390,73 +502,66 @@ class DetectEvents:
     # -----------------------------------------------
     # process_events helper function: Detect trigger signal rising and falling edge events
     def create_df_signal_event(self, trigger_signal, event, df):
+        import numpy as np
         import pandas as pd
-        
+
+        # Evaluate thresholds and edge bookkeeping on the raw NumPy array - a
+        # handful of vectorized passes over small temporaries instead of a
+        # chain of full pandas columns (the input frame stays unmodified)
+        signal = df[trigger_signal].to_numpy()
         if event["exact_match"]:
-            df['below_lower'] = df[trigger_signal] == event["lower_threshold"]
-            df['above_upper'] = df[trigger_signal] == event["upper_threshold"]
+            below_lower = signal == event["lower_threshold"]
+            above_upper = signal == event["upper_threshold"]
         else:
-            df['below_lower'] = df[trigger_signal] <= event["lower_threshold"]
-            df['above_upper'] = df[trigger_signal] >= event["upper_threshold"]
+            below_lower = signal <= event["lower_threshold"]
+            above_upper = signal >= event["upper_threshold"]
 
-        # Track when the signal was last below the lower threshold or above the upper threshold
-        df['was_below_lower'] = df['below_lower'].rolling(window=len(df), min_periods=1).max().shift(1, fill_value=0)
-        df['was_above_upper'] = df['above_upper'].rolling(window=len(df), min_periods=1).max().shift(1, fill_value=0)
+        # Track when the signal was last below the lower threshold or above the
+        # upper threshold (cumulative OR, shifted by one sample)
+        was_below_lower = np.zeros(len(signal), dtype=bool)
+        was_above_upper = np.zeros(len(signal), dtype=bool)
+        if len(signal) > 1:
+            np.maximum.accumulate(below_lower[:-1], out=was_below_lower[1:])
+            np.maximum.accumulate(above_upper[:-1], out=was_above_upper[1:])
 
-        # Create event groups to detect transitions from below_lower to above_upper or vice versa
-        df['event_group_rise'] = (df['below_lower'] != df['below_lower'].shift(1)).cumsum()
-        df['event_group_fall'] = (df['above_upper'] != df['above_upper'].shift(1)).cumsum()
+        # Group ids increment whenever the threshold flag flips; keeping the
+        # first candidate per group matches drop_duplicates(keep="first")
+        group_rise = np.cumsum(np.concatenate(([False], below_lower[1:] != below_lower[:-1])))
+        group_fall = np.cumsum(np.concatenate(([False], above_upper[1:] != above_upper[:-1])))
 
         # Identify rising/falling edges in the data
-        df_rising = df[df['above_upper'] & (df['was_below_lower'] == 1)].drop_duplicates(subset='event_group_rise', keep='first')
-        df_falling = df[df['below_lower'] & (df['was_above_upper'] == 1)].drop_duplicates(subset='event_group_fall', keep='first')
-        
+        rising_idx = np.flatnonzero(above_upper & was_below_lower)
+        if rising_idx.size:
+            rising_idx = rising_idx[np.concatenate(([True], np.diff(group_rise[rising_idx]) != 0))]
+
+        falling_idx = np.flatnonzero(below_lower & was_above_upper)
+        if falling_idx.size:
+            falling_idx = falling_idx[np.concatenate(([True], np.diff(group_fall[falling_idx]) != 0))]
+
         # Depending on the detection logic, assign event start/stop to either rising/falling edges
         if event["rising_as_start"]:
-            df_start = df_rising
-            df_stop = df_falling
+            start_idx, stop_idx = rising_idx, falling_idx
         else:
-            df_start = df_falling
-            df_stop = df_rising
-        
+            start_idx, stop_idx = falling_idx, rising_idx
+
         # Assign meta information
+        df_start = df.iloc[start_idx].copy()
         df_start['EventType'] = 'Start'
         df_start['EventValue'] = 1
+        df_stop = df.iloc[stop_idx].copy()
         df_stop['EventType'] = 'Stop'
         df_stop['EventValue'] = 0
 
         # Combine start/stop events, and sort by index
         df_signal_event = pd.concat([df_start, df_stop]).sort_index()
-    
+
         return df_signal_event
     
     # -----------------------------------------------
-    # process_events helper function: Create events meta dataframe
-    def create_df_signal_event_meta(self, df_signal_event, trigger_signal, event_name, device, messages, include_gps_data, signal_latitude, signal_longitude):
-        import pandas as pd
+    # process_events helper function: Create events meta Arrow table
+    def create_signal_event_meta_table(self, df_signal_event, trigger_signal, event_name, device, messages, include_gps_data, signal_latitude, signal_longitude):
         import pyarrow as pa
 
-        # Create new data frame based on the event data
-        df_signal_event_meta = pd.DataFrame()
-        df_signal_event_meta.index = df_signal_event.index 
-        df_signal_event_meta["EventName"] = event_name
-        df_signal_event_meta["DeviceID"] = device 
-        df_signal_event_meta["EventId"] = df_signal_event_meta.index.strftime(f"{event_name}_{device}_%Y%m%dT%H%M%S")
-        df_signal_event_meta["SignalValue"] = df_signal_event[trigger_signal]
-        df_signal_event_meta["EventType"] = df_signal_event["EventType"]
-        df_signal_event_meta["EventValue"] = df_signal_event["EventValue"]
-        df_signal_event_meta["Message"] = messages[0] 
-        df_signal_event_meta["Signal"] = trigger_signal
-        
-        # If GPS data is to be included, ensure consistent column structure (even if no valid GPS data was extracted)
-        if include_gps_data:
-            try:
-                df_signal_event_meta["Latitude"] = df_signal_event[signal_latitude]
-                df_signal_event_meta["Longitude"] = df_signal_event[signal_longitude]
-            except:
-                df_signal_event_meta["Latitude"] = pd.NA
-                df_signal_event_meta["Longitude"] = pd.NA
-                                            
         # Define a Parquet schema to ensure correct and consistent type mapping
         schema = pa.schema(
             [
@@ -472,9 +577,32 @@ class DetectEvents:
                 ("Latitude", pa.float64()),
                 ("Longitude", pa.float64())
             ]
-        )    
-        
-        return df_signal_event_meta, schema
+        )
+
+        # Build the Arrow columns directly from the event data - this skips the
+        # intermediate pandas frame and the Table.from_pandas conversion
+        row_count = len(df_signal_event)
+        columns = {
+            "t": pa.array(df_signal_event.index.to_numpy()).cast(pa.timestamp("us")),
+            "EventName": pa.array([event_name] * row_count),
+            "DeviceID": pa.array([device] * row_count),
+            "EventId": pa.array(df_signal_event.index.strftime(f"{event_name}_{device}_%Y%m%dT%H%M%S")),
+            "Message": pa.array([messages[0]] * row_count),
+            "Signal": pa.array([trigger_signal] * row_count),
+            "EventType": pa.array(df_signal_event["EventType"], from_pandas=True),
+            "EventValue": pa.array(df_signal_event["EventValue"], type=pa.int64(), from_pandas=True),
+            "SignalValue": pa.array(df_signal_event[trigger_signal], type=pa.float64(), from_pandas=True),
+        }
+
+        # If GPS data is to be included, ensure consistent column structure (even if no valid GPS data was extracted)
+        if include_gps_data and signal_latitude in df_signal_event and signal_longitude in df_signal_event:
+            columns["Latitude"] = pa.array(df_signal_event[signal_latitude], type=pa.float64(), from_pandas=True)
+            columns["Longitude"] = pa.array(df_signal_event[signal_longitude], type=pa.float64(), from_pandas=True)
+        else:
+            columns["Latitude"] = pa.nulls(row_count, pa.float64())
+            columns["Longitude"] = pa.nulls(row_count, pa.float64())
+
+        return pa.Table.from_arrays([columns[field.name] for field in schema], schema=schema)
     
 
 # -----------------------------------------------------------           
@@ -483,40 +611,37 @@ class DetectEvents:
 
 # -----------------------------------------------
 # process_events helper function: Extract messages_filtered_list depending on matching logic for event or custom message data
-def get_messages_filtered_list(tmp_output_dir, data):
+def get_messages_filtered_list(decoded_files, data):
     if data["messages_match_type"] == "equals":
         messages_filtered_list = data["messages_filtered_list"]
     elif data["messages_match_type"] == "contains":
-        messages_filtered_list = [[path.parts[-5] for path in tmp_output_dir.rglob(f'*/*{data["messages_filtered_list"]}*/**/*.parquet') or [None]]]
+        # Filter the already-listed decoded files in memory instead of walking
+        # the output directory again (the message is the 5th part from the end)
+        messages_filtered_list = [[path.parts[-5] for path in decoded_files if data["messages_filtered_list"] in path.parts[-5]] or [None]]
     elif data["messages_match_type"] == "all_messages":
         messages_filtered_list = [["ALL"]]
-    return messages_filtered_list 
+    return messages_filtered_list
 
 # Upload all files in dir to cloud storage
 def upload_files_to_cloud(cloud, storage_client, bucket_output, dir):
-    from pathlib import Path
-    import logging
-    import os
-    
     logger = logging.getLogger()
     
-    # Create list of all local Parquet files and count non-empty folders
-    parquet_files = []
-    non_empty_folders = 0
-    
-    for folder in dir.glob("**"):
-        if any(folder.glob("*")):
-            non_empty_folders += 1
-            for file in folder.glob("*.parquet"):
-                parquet_files.append(file)
-    
-    # Upload files to cloud storage
-    uploaded_files = 0    
-    for file in parquet_files:
+    # Create list of all local Parquet files in a single recursive walk
+    parquet_files = list(dir.rglob("*.parquet"))
+
+    # Upload one file (used by the upload pool below)
+    def upload_one(file):
         relative_path = str(file.relative_to(dir)).replace(os.sep, '/')
         upload_object(cloud, storage_client, bucket_output, relative_path, str(file), logger)
-        uploaded_files += 1
-        
+
+    # Upload files to cloud storage in parallel - each PUT is an independent
+    # blocking round-trip
+    uploaded_files = 0
+    if parquet_files:
+        with ThreadPoolExecutor(max_workers=min(16, len(parquet_files))) as executor:
+            list(executor.map(upload_one, parquet_files))
+        uploaded_files = len(parquet_files)
+
     # Print results
     logger.info(f"Uploaded {uploaded_files} Parquet files")
     
@@ -530,13 +655,25 @@ def upload_files_to_cloud(cloud, storage_client, bucket_output, dir):
 
 # -----------------------------------------------------------
 # Load Parquet file to data frame (optionally rename columns for uniqueness, optionally resample)
-def load_parquet_to_df(fs_output_file, message, raster="", prefix=False):
+def load_parquet_to_df(fs_output_file, message, raster="", prefix=False, columns=None):
     import pyarrow.parquet as pq
     import pandas as pd
 
-    table = pq.read_table(fs_output_file)
-    df = table.to_pandas()
-    df["t"] = pd.to_datetime(df["t"])
+    # If the caller knows which signals it needs, read only those columns (plus
+    # the timestamp) - decode cost scales with the columns materialized
+    if columns is not None:
+        available = pq.read_schema(fs_output_file).names
+        read_columns = ["t"] + [col for col in columns if col in available and col != "t"]
+        table = pq.read_table(fs_output_file, columns=read_columns)
+    else:
+        table = pq.read_table(fs_output_file)
+
+    # The timestamp column arrives from parquet already typed, so no
+    # pd.to_datetime re-conversion (a full column copy) is needed;
+    # self_destruct releases the Arrow buffers during the conversion
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    if not pd.api.types.is_datetime64_any_dtype(df["t"]):
+        df["t"] = pd.to_datetime(df["t"])
     df.set_index("t", inplace=True)
 
     if prefix:
@@ -550,35 +687,41 @@ def load_parquet_to_df(fs_output_file, message, raster="", prefix=False):
     return df
 
 # -----------------------------------------------------------
-# Build a dictionary of all valid paths with key tuples of devices, dates, file_names and messages as values.
+# Build a dictionary of all valid paths with key tuples of devices, dates, file_names and messages as values,
+# plus an inverted message -> key-set index for fast filtering.
 def get_all_message_paths(decoded_files):
     all_message_paths = {}
-    
+    message_to_keys = {}
+
     # Iterate over all decoded files, create keys from path components and add messages as values
     for decoded_file in decoded_files:
         p = decoded_file.parts
         device, message, yyyy, mm, dd, file_name = p[-6], p[-5], p[-4], p[-3], p[-2], p[-1]
         date = f"{yyyy}/{mm}/{dd}"
         key = (device, date, file_name)
-        
+
         if key not in all_message_paths:
             all_message_paths[key] = []
-        
+
         all_message_paths[key].append(message)
-    
-    return all_message_paths
+        message_to_keys.setdefault(message, set()).add(key)
+
+    return all_message_paths, message_to_keys
 
 # -----------------------------------------------------------
 # Build a dictionary of filtered paths with key tuples of devices, dates, file_names and messages as values.
-def get_related_message_paths(all_message_paths, messages_filtered): 
-    
+def get_related_message_paths(all_message_paths, message_to_keys, messages_filtered):
+
     if messages_filtered == ["ALL"]:
         return all_message_paths
-    elif len(messages_filtered) > 0:    
+    elif len(messages_filtered) > 0:
+        # Intersect the key sets from the inverted index - only keys holding
+        # every filtered message survive, without scanning all path entries
+        keys = set.intersection(*(message_to_keys.get(msg, set()) for msg in messages_filtered))
         related_message_paths = {
                 key: [msg for msg in msgs if msg in messages_filtered]  # Reduce to relevant messages
                 for key, msgs in all_message_paths.items()
-                if all(msg in msgs for msg in messages_filtered)  # Ensure all filtered messages are present
+                if key in keys
             }
         return related_message_paths
     else:
@@ -587,8 +730,6 @@ def get_related_message_paths(all_message_paths, messages_filtered):
 # -----------------------------------------------------------
 # Haversine function to calculate distance in km between two lat/lon points (used in calculated signals example)
 def haversine(lat1, lon1, lat2, lon2):
-    import math 
-        
     lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
     lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
     dlat = lat2_rad - lat1_rad
@@ -603,17 +744,82 @@ def haversine(lat1, lon1, lat2, lon2):
 # Function to check if a point is inside any geofence and return the name and ID
 def check_geofence(row, signal_latitude, signal_longitude, geofences):
     lat, lon = row[signal_latitude], row[signal_longitude]
-    
+
     for geofence in geofences:
         geofence_id, geofence_name, (geofence_lat, geofence_lon), geofence_radius = geofence
+
+        # Cheap bounding-box rejection before the trig: a degree of latitude is
+        # at least ~110 km, so a point whose latitude differs by more than the
+        # radius in degrees cannot be inside the fence (conservative tolerance,
+        # so no false rejections)
+        deg_tol = geofence_radius / 110.0
+        if abs(lat - geofence_lat) > deg_tol:
+            continue
+
         distance_in_km = haversine(lat, lon, geofence_lat, geofence_lon)
-        
+
         if distance_in_km <= geofence_radius:
             return geofence_id
 
     return 0 # return 0 if no geofence is matched
 
-# -----------------------------------------------------------           
+# -----------------------------------------------------------
+# Vectorized haversine: same formula as haversine, but over NumPy arrays of
+# lat/lon points (either side may also be a scalar, e.g. a geofence center)
+def haversine_vectorized(lat1, lon1, lat2, lon2):
+    import numpy as np
+
+    lat1_rad, lon1_rad = np.radians(lat1), np.radians(lon1)
+    lat2_rad, lon2_rad = np.radians(lat2), np.radians(lon2)
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    distance_in_km = 6371.0 * c
+
+    return distance_in_km
+
+# -----------------------------------------------------------
+# Vectorized variant of check_geofence: matches all rows of a dataframe against
+# the geofences in one haversine pass per geofence instead of one per row
+def check_geofences_vectorized(df_messages, signal_latitude, signal_longitude, geofences):
+    import numpy as np
+
+    lat = df_messages[signal_latitude].to_numpy(dtype="float64")
+    lon = df_messages[signal_longitude].to_numpy(dtype="float64")
+
+    geofence_ids = np.zeros(len(lat), dtype="int64") # 0 means no geofence matched
+
+    for geofence in geofences:
+        geofence_id, geofence_name, (geofence_lat, geofence_lon), geofence_radius = geofence
+
+        # Cheap bounding-box rejection before the trig: only rows inside the
+        # fence's lat/lon box (conservative degree tolerances, so no false
+        # rejections) go through the haversine
+        deg_tol = geofence_radius / 110.0
+        candidates = (np.abs(lat - geofence_lat) <= deg_tol) & (geofence_ids == 0)
+
+        # Longitude degrees shrink with latitude; widen the tolerance using the
+        # smallest cosine inside the box, and handle the antimeridian wrap
+        cos_lat = math.cos(math.radians(min(abs(geofence_lat) + deg_tol, 90.0)))
+        if cos_lat > 1e-9:
+            dlon = np.abs(lon - geofence_lon)
+            dlon = np.where(dlon > 180.0, 360.0 - dlon, dlon)
+            candidates &= dlon <= deg_tol / cos_lat
+
+        candidate_rows = np.flatnonzero(candidates)
+        if candidate_rows.size == 0:
+            continue
+
+        distance_in_km = haversine_vectorized(lat[candidate_rows], lon[candidate_rows], geofence_lat, geofence_lon)
+
+        # Only fill rows that no earlier geofence matched, so the first listed
+        # geofence wins like in check_geofence
+        geofence_ids[candidate_rows[distance_in_km <= geofence_radius]] = geofence_id
+
+    return geofence_ids
+
+# -----------------------------------------------------------
 # -----------------------------------------------------------
 # Class for processing backlog.json with flexible prefix specification
 class ProcessBacklog:
@@ -622,16 +828,12 @@ class ProcessBacklog:
         self.cloud = cloud
         self.storage_client = storage_client
         self.bucket_input = bucket_input
-        self.valid_extensions = [".MF4", ".MFC", ".MFE", ".MFM"]
         self.min_batch_size = min_batch_size
         self.max_batch_size = max_batch_size
+        self._normalized_prefixes = {}  # memoized normalize_prefix results
         
     def download_backlog_json(self):
         """Download backlog.json from the root of the input bucket/container"""
-        import tempfile
-        import json
-        from pathlib import Path
-        
         with tempfile.TemporaryDirectory() as temp:
             tmp_dir = Path(temp)
             backlog_file_path = tmp_dir / "backlog.json"
@@ -695,90 +897,93 @@ class ProcessBacklog:
         
     def has_valid_extension(self, filename):
         """Check if a file has a valid extension"""
-        return any(filename.upper().endswith(ext) for ext in self.valid_extensions)
+        # Uppercase only the 4-char suffix instead of the full object key -
+        # this runs once per listed object, so the per-call allocation matters
+        return filename[-4:].upper() in _VALID_EXTENSIONS
     
     def is_likely_file_path(self, path):
         """Check if a path is likely a file path rather than a prefix"""
         # If it has a valid extension, it's a file
         if self.has_valid_extension(path):
             return True
-            
-        # Look for patterns that suggest it's a file (has extension part with dot)
-        parts = path.split('/')
-        last_part = parts[-1] if parts else ""
-        # If the last part contains a dot, it's likely a file
-        if '.' in last_part:
-            return True
-            
-        return False
+
+        # If the part after the last slash contains a dot, it's likely a file
+        # (scanning the tail directly avoids splitting the path into a list)
+        return '.' in path[path.rfind('/') + 1:]
     
     def normalize_prefix(self, path):
         """Ensure path ends with a trailing slash if it's a prefix"""
         if not path:
             return path
-            
+
+        # The same path is normalized several times per backlog entry (directly
+        # and via the device/session prefix checks), so memoize per instance
+        cached = self._normalized_prefixes.get(path)
+        if cached is not None:
+            return cached
+
         # Don't add a slash if the path appears to be a file
         if self.is_likely_file_path(path):
-            return path
-            
+            normalized_path = path
         # Only add slash if needed for prefix paths
-        if not path.endswith('/'):
+        elif not path.endswith('/'):
             normalized_path = f"{path}/"
-            self.logger.info(f"Adding missing trailing slash to prefix: {path} -> {normalized_path}")
-            return normalized_path
-        return path
+            self.logger.info("Adding missing trailing slash to prefix: %s -> %s", path, normalized_path)
+        else:
+            normalized_path = path
+
+        self._normalized_prefixes[path] = normalized_path
+        return normalized_path
         
     def is_device_prefix(self, path):
         """Check if the path is a device prefix (e.g. '0BFD7754/' or '0BFD7754')"""
-        import re
         # Normalize path to ensure it has a trailing slash
         normalized_path = self.normalize_prefix(path)
         # Device ID is an 8 character HEX string followed by a slash
-        is_device = bool(re.match(r'^[0-9A-F]{8}/$', normalized_path))
+        is_device = bool(_DEVICE_PREFIX_RE.match(normalized_path))
         return is_device
     
     def is_session_prefix(self, path):
         """Check if the path is a session prefix (e.g. '0BFD7754/00000001/' or '0BFD7754/00000001')"""
-        import re
         # Normalize path to ensure it has a trailing slash
         normalized_path = self.normalize_prefix(path)
         # Session prefix has device ID, followed by 8-digit session number and a slash
-        is_session = bool(re.match(r'^[0-9A-F]{8}/[0-9]{8}/$', normalized_path))
+        is_session = bool(_SESSION_PREFIX_RE.match(normalized_path))
         return is_session
     
     def list_sessions(self, device_prefix):
         """List all sessions for a device prefix and return all objects for efficient processing"""
-        import re
-        
         # Ensure device prefix has trailing slash
         device_prefix = self.normalize_prefix(device_prefix)
         
         sessions = set()
         objects_by_session = {}
         valid_file_count = 0
-        
-        # Use the pagination-aware listing function from cloud_functions.py
-        response = list_objects_with_pagination(self.cloud, self.storage_client, self.bucket_input, self.logger, device_prefix)
-        
-        # Extract session folders from object paths and organize objects by session
-        for obj in response["objects"]:
+
+        # Stream the paginated listing from cloud_functions.py and organize the
+        # objects by session as pages arrive - the full listing is never held
+        # as a list, so peak memory follows the matching log files only
+        tail_start = len(device_prefix)
+        for obj in iter_objects(self.cloud, self.storage_client, self.bucket_input, self.logger, device_prefix):
             name = obj["name"]
-            # Match the session folder pattern: deviceid/sessionid/
-            match = re.match(f"^{device_prefix}([0-9]{{8}})/", name)
-            if match:
-                session_prefix = f"{device_prefix}{match.group(1)}/"
+            # Only consider log files with valid extensions
+            if not self.has_valid_extension(name):
+                continue
+            # Match the session folder pattern: deviceid/sessionid/ - the listing
+            # already guarantees the device_prefix part, so a slice and digit
+            # check on the 8-character tail replaces a per-object regex match
+            if len(name) > tail_start + 8 and name[tail_start + 8] == '/' and name[tail_start:tail_start + 8].isdigit():
+                session_prefix = name[:tail_start + 9]
                 sessions.add(session_prefix)
-                
+
                 # Store object by session for later use
                 if session_prefix not in objects_by_session:
                     objects_by_session[session_prefix] = []
-                
-                # Only add files with valid extensions
-                if self.has_valid_extension(name):
-                    objects_by_session[session_prefix].append(name)
-                    valid_file_count += 1
+
+                objects_by_session[session_prefix].append(name)
+                valid_file_count += 1
         
-        self.logger.info(f"Found {valid_file_count} log files in {device_prefix}")
+        self.logger.info("Found %s log files in %s", valid_file_count, device_prefix)
         return sorted(list(sessions)), objects_by_session
     
     def list_files_in_session(self, session_prefix):
@@ -787,15 +992,12 @@ class ProcessBacklog:
         session_prefix = self.normalize_prefix(session_prefix)
         
         valid_files = []
-        # Use the pagination-aware listing function from cloud_functions.py
-        response = list_objects_with_pagination(self.cloud, self.storage_client, self.bucket_input, self.logger, session_prefix)
-        
-        for obj in response["objects"]:
-            name = obj["name"]
-            if self.has_valid_extension(name):
-                valid_files.append(name)
+        # Stream the paginated listing, keeping only valid log files
+        for obj in iter_objects(self.cloud, self.storage_client, self.bucket_input, self.logger, session_prefix):
+            if self.has_valid_extension(obj["name"]):
+                valid_files.append(obj["name"])
         
-        self.logger.info(f"Found {len(valid_files)} log files in {session_prefix}")
+        self.logger.info("Found %s log files in %s", len(valid_files), session_prefix)
         return sorted(valid_files)
     
     def process_backlog_from_cloud(self):
@@ -828,7 +1030,7 @@ class ProcessBacklog:
                     continue
                 # Extract device ID from first file in batch (device ID is the first part of the path)
                 first_file = batch[0]
-                device_id = first_file.split('/')[0] if '/' in first_file else None
+                device_id = first_file.partition('/')[0] if '/' in first_file else None
                 
                 if device_id:
                     # Initialize device batch list if needed
@@ -861,69 +1063,92 @@ class ProcessBacklog:
     
     def process_mdf_batches(self, backlog_batches):
         """Process MDF batches using mdf_to_parquet"""
-        from .mdf_to_parquet import mdf_to_parquet
-        
         total_items = sum(len(batch) for batch in backlog_batches)
         self.logger.info(f"Processing {len(backlog_batches)} batches with {total_items} unique objects in total")
-        
-        # Process each batch
-        batch_results = []
-        for i, batch in enumerate(backlog_batches, 1):
+
+        # Set up required parameters for mdf_to_parquet - created once and
+        # shared across batches (the boto3 client is thread-safe)
+        notification_client = False  # ensures notifications are not sent for events during backlog processing
+        bucket_output = f"{self.bucket_input}-parquet"
+
+        # For Amazon, initialize notification client
+        if self.cloud == "Amazon":
+            import boto3
+            notification_client = boto3.client('sns')
+
+        # Process one batch (used by the batch pool below)
+        def process_batch(task):
+            i, batch = task
             self.logger.info(f"\n\n\nBACKLOG: PROCESS BATCH {i} OF {len(backlog_batches)} ({len(batch)} OBJECTS)")
             try:
-                # Set up required parameters for mdf_to_parquet
-                notification_client = False  # ensures notifications are not sent for events during backlog processing
-                bucket_output = f"{self.bucket_input}-parquet"
-                
-                # For Amazon, initialize notification client
-                if self.cloud == "Amazon":
-                    import boto3
-                    notification_client = boto3.client('sns')
-                
                 # Call mdf_to_parquet directly
                 mdf_to_parquet(self.cloud, self.storage_client, notification_client, batch, self.bucket_input, bucket_output)
-                batch_results.append(True)
+                return True
             except Exception as e:
                 self.logger.error(f"Error processing batch {i}: {e}")
-                batch_results.append(False)
-        
+                return False
+
+        # Process batches concurrently - each batch is an independent
+        # download -> decode -> upload pipeline that mostly waits on blob
+        # round-trips; MDF_PARALLELISM bounds how many are in flight
+        max_workers = max(1, int(os.environ.get("MDF_PARALLELISM", "4")))
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(backlog_batches)) or 1) as executor:
+            batch_results = list(executor.map(process_batch, enumerate(backlog_batches, 1)))
+
         # Return the combined result (True if all batches succeeded)
         return all(batch_results)
     
     def process_backlog(self, backlog_file_data):
         """Process the backlog data to expand prefixes into individual file paths"""
-        import re
         result = []
         processed_sessions = set()  # Track sessions we've already processed
+        result_by_session = {}  # Map session prefix -> its list inside result, for O(1) lookup
         
         for entry_list in backlog_file_data:
             # Process each item in the list
             session_lists = {}
-            
-            for original_item in entry_list:
-                # Normalize the item once, at the beginning of processing
-                item = self.normalize_prefix(original_item) if original_item else original_item
-                
-                # Now use the normalized item for prefix checking
+            session_seen = {}  # Companion sets for O(1) duplicate checks per session
+
+            # Normalize every item once, then prefetch the cloud listings for
+            # all device/session prefixes concurrently - each listing is a
+            # blocking paginated round-trip and the prefixes are independent.
+            # Session prefixes covered by a listed device prefix are skipped,
+            # since the device listing already returns their files
+            normalized_items = [self.normalize_prefix(item) if item else item for item in entry_list]
+            device_prefixes = {item for item in normalized_items if item and _DEVICE_PREFIX_RE.match(item)}
+            session_prefixes = {item for item in normalized_items
+                                if item and _SESSION_PREFIX_RE.match(item)
+                                and item not in processed_sessions and item[:9] not in device_prefixes}
+
+            listing_futures = {}
+            if device_prefixes or session_prefixes:
+                with ThreadPoolExecutor(max_workers=min(32, len(device_prefixes) + len(session_prefixes))) as listing_pool:
+                    for prefix in device_prefixes:
+                        listing_futures[prefix] = listing_pool.submit(self.list_sessions, prefix)
+                    for prefix in session_prefixes:
+                        listing_futures[prefix] = listing_pool.submit(self.list_files_in_session, prefix)
+
+            for original_item, item in zip(entry_list, normalized_items):
+                # Log when the upfront normalization changed the item
                 if original_item != item:
-                    self.logger.info(f"Using normalized prefix: {item}")
+                    self.logger.info("Using normalized prefix: %s", item)
                 
                 # Case 1 (device prefix): List all sessions and process each separately
-                if re.match(r'^[0-9A-F]{8}/$', item):
-                    sessions, objects_by_session = self.list_sessions(item)
+                if _DEVICE_PREFIX_RE.match(item):
+                    sessions, objects_by_session = listing_futures[item].result()
                     
                     # Count total valid files found across all sessions
                     total_valid_files = sum(len(files) for files in objects_by_session.values())
-                    self.logger.info(f"Found {len(sessions)} sessions and {total_valid_files} valid files for device {item}")
+                    self.logger.info("Found %s sessions and %s valid files for device %s", len(sessions), total_valid_files, item)
                     
                     for session in sessions:
                         # Skip if we've already processed this session
                         if session in processed_sessions:
-                            self.logger.info(f"Session already processed, skipping: {session}")
+                            self.logger.info("Session already processed, skipping: %s", session)
                             continue
                             
                         processed_sessions.add(session)
-                        self.logger.info(f"Found session: {session}")
+                        self.logger.info("Found session: %s", session)
                         
                         # Use the objects we already retrieved instead of making another API call
                         files = objects_by_session.get(session, [])
@@ -931,69 +1156,70 @@ class ProcessBacklog:
                             session_lists[session] = files
 
                 # Case 2 (session prefix): List all objects
-                elif re.match(r'^[0-9A-F]{8}/[0-9]{8}/$', item):
+                elif _SESSION_PREFIX_RE.match(item):
                     # Skip if we've already processed this session
                     if item in processed_sessions:
-                        self.logger.info(f"Session already processed, skipping: {item}")
+                        self.logger.info("Session already processed, skipping: %s", item)
                         continue
 
                     processed_sessions.add(item)
                     
                     # Check if we already have files for this session from a previous device prefix listing
                     if item in session_lists and session_lists[item]:
-                        self.logger.info(f"Using previously listed files for session {item} ({len(session_lists[item])} files)")
+                        self.logger.info("Using previously listed files for session %s (%s files)", item, len(session_lists[item]))
                     else:
-                        # Only make an API call if we don't already have the files
-                        files = self.list_files_in_session(item)
+                        # Use the prefetched listing when available; sessions
+                        # covered by a device prefix fall back to a direct call
+                        if item in listing_futures:
+                            files = listing_futures[item].result()
+                        else:
+                            files = self.list_files_in_session(item)
                         if files:
                             session_lists[item] = files
 
                 # Case 3: Individual file: Add directly if it has valid extension
                 elif self.has_valid_extension(item):
-                    # Extract session path from item
-                    parts = item.split('/')
+                    # Extract the session path (first two segments) without
+                    # splitting the full item into a list of parts
+                    parts = item.split('/', 2)
                     if len(parts) >= 3:
                         session_prefix = f"{parts[0]}/{parts[1]}/"
 
                         # Initialize the session files list if needed
                         if session_prefix not in session_lists:
-                            # If we've already processed this session in an earlier list,
-                            # initialize with the files we already have
-                            if session_prefix in processed_sessions:
-                                # This session was processed before, but we still need to add any new files
-                                # Find the existing list with this session
-                                existing_list = None
-                                for list_index, file_list in enumerate(result):
-                                    # Check if this list contains files from the same session
-                                    if file_list and file_list[0].startswith(session_prefix):
-                                        existing_list = list_index
-                                        break
-                                        
-                                if existing_list is not None:
-                                    # We found the existing list, initialize with its files
-                                    session_lists[session_prefix] = result[existing_list].copy()
-                                    # Remove the existing list since we'll replace it
-                                    result.pop(existing_list)
-                                else:
-                                    session_lists[session_prefix] = []
+                            # If this session already has a result batch from an
+                            # earlier list, extend that batch in place - an O(1)
+                            # dict lookup instead of scanning result and doing
+                            # the pop/re-append dance
+                            if session_prefix in processed_sessions and session_prefix in result_by_session:
+                                session_lists[session_prefix] = result_by_session[session_prefix]
                             else:
                                 session_lists[session_prefix] = []
                                 
-                        # Add file if not already in the list
-                        if item not in session_lists[session_prefix]:
+                        # Add file if not already in the list - membership is
+                        # checked against a set instead of scanning the list
+                        seen = session_seen.get(session_prefix)
+                        if seen is None:
+                            seen = session_seen[session_prefix] = set(session_lists[session_prefix])
+                        if item not in seen:
+                            seen.add(item)
                             session_lists[session_prefix].append(item)
                         else:
-                            self.logger.info(f"Duplicate file skipped: {item}")
+                            self.logger.info("Duplicate file skipped: %s", item)
             
             # Mark all sessions as processed
             for session in session_lists:
                 processed_sessions.add(session)
                 
-            # Convert session_lists dictionary to list format
+            # Convert session_lists dictionary to list format - every source
+            # (session listings and the set-guarded file appends) is already
+            # duplicate-free, so no extra dedupe pass is needed
             for session, files in session_lists.items():
                 if files:  # Only include non-empty lists
-                    # Remove any duplicates before adding
-                    unique_files = list(dict.fromkeys(files))  # Preserves order while removing duplicates
-                    result.append(unique_files)
+                    # Lists extended in place above already live inside result
+                    if result_by_session.get(session) is files:
+                        continue
+                    result.append(files)
+                    result_by_session[session] = files
         
         return result